@@ -0,0 +1,30 @@
+"""order_stock_deducted
+
+Revision ID: 004_order_stock_deducted
+Revises: 003_product_search
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_order_stock_deducted'
+down_revision = '003_product_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('orders', sa.Column('stock_deducted_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Orders settled before this migration already had their stock deducted
+    op.execute("""
+        UPDATE orders
+        SET stock_deducted_at = COALESCE(updated_at, now())
+        WHERE order_status IN ('paid', 'completed')
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('orders', 'stock_deducted_at')
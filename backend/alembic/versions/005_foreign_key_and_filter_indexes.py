@@ -0,0 +1,44 @@
+"""foreign_key_and_filter_indexes
+
+Revision ID: 005_fk_filter_indexes
+Revises: 004_order_stock_deducted
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_fk_filter_indexes'
+down_revision = '004_order_stock_deducted'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building
+    # concurrently avoids blocking writes on the live tables.
+    # If a build fails it leaves an INVALID index: drop it and re-run.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_cart_user_id_product_id', 'cart', ['user_id', 'product_id'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index('ix_orders_user_id_updated_at', 'orders', ['user_id', 'updated_at'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index(op.f('ix_orders_product_id'), 'orders', ['product_id'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index(op.f('ix_orders_order_status'), 'orders', ['order_status'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index(op.f('ix_transactions_order_id'), 'transactions', ['order_id'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index('ix_products_live_created_at_id', 'products', ['created_at', 'id'], unique=False,
+                        postgresql_where=sa.text('is_deleted = false'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_products_live_created_at_id', table_name='products', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_transactions_order_id'), table_name='transactions', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_orders_order_status'), table_name='orders', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_orders_product_id'), table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_user_id_updated_at', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_cart_user_id_product_id', table_name='cart', postgresql_concurrently=True)
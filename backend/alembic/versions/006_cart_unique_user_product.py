@@ -0,0 +1,54 @@
+"""cart_unique_user_product
+
+Revision ID: 006_cart_unique_user_product
+Revises: 005_fk_filter_indexes
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_cart_unique_user_product'
+down_revision = '005_fk_filter_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Merge duplicate (user_id, product_id) rows into the oldest one
+    op.execute("""
+        WITH totals AS (
+            SELECT MIN(id) AS keep_id, SUM(quantity) AS quantity
+            FROM cart
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id, product_id
+            HAVING COUNT(*) > 1
+        )
+        UPDATE cart
+        SET quantity = totals.quantity, updated_at = now()
+        FROM totals
+        WHERE cart.id = totals.keep_id
+    """)
+    op.execute("""
+        DELETE FROM cart
+        USING cart AS keeper
+        WHERE cart.user_id = keeper.user_id
+          AND cart.product_id = keeper.product_id
+          AND cart.id > keeper.id
+    """)
+
+    # Build the unique index without blocking writes, then attach it as the
+    # constraint. It supersedes the plain composite index from 005.
+    with op.get_context().autocommit_block():
+        op.create_index('uq_cart_user_id_product_id', 'cart', ['user_id', 'product_id'], unique=True,
+                        postgresql_concurrently=True)
+        op.execute("ALTER TABLE cart ADD CONSTRAINT uq_cart_user_id_product_id UNIQUE USING INDEX uq_cart_user_id_product_id")
+        op.drop_index('ix_cart_user_id_product_id', table_name='cart', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_cart_user_id_product_id', 'cart', ['user_id', 'product_id'], unique=False,
+                        postgresql_concurrently=True)
+    op.drop_constraint('uq_cart_user_id_product_id', 'cart', type_='unique')
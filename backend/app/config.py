@@ -9,6 +9,24 @@ class Settings(BaseSettings):
     # Database
     database_url: str = os.getenv("DATABASE_URL")
     
+    # Optional streaming replica for read-only listings. Reads fall back to the
+    # primary while its lag exceeds replica_max_lag_seconds. Routes that fill
+    # the catalog cache always read the primary, so cached entries are never stale
+    database_replica_url: Optional[str] = os.getenv("DATABASE_REPLICA_URL") or None
+    replica_max_lag_seconds: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    replica_lag_check_interval_seconds: float = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL_SECONDS", "2"))
+    # The replica counts as disconnected once its WAL receiver has heard nothing
+    # for this long; idle primaries ping about every wal_receiver_timeout / 2
+    replica_receiver_timeout_seconds: float = float(os.getenv("REPLICA_RECEIVER_TIMEOUT_SECONDS", "60"))
+
+    # SQLAlchemy connection pools (per worker process, sync and async). Keep
+    # workers * 2 * (pool_size + max_overflow) + listeners below Postgres max_connections
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout_seconds: int = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    db_pool_recycle_seconds: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
     # PostgreSQL Environment Variables (for docker-compose)
     postgres_user: str = os.getenv("POSTGRES_USER", "vintique_user")
     postgres_password: Optional[str] = os.getenv("POSTGRES_PASSWORD")
@@ -25,14 +43,30 @@ class Settings(BaseSettings):
     cloudinary_cloud_name: str = os.getenv("CLOUDINARY_CLOUD_NAME")
     cloudinary_api_key: str = os.getenv("CLOUDINARY_API_KEY")
     cloudinary_api_secret: str = os.getenv("CLOUDINARY_API_SECRET")
+    # Upload API base URL; unset for Cloudinary itself (e.g. benchmarks/fake_cloudinary.py for load tests)
+    cloudinary_upload_prefix: Optional[str] = os.getenv("CLOUDINARY_UPLOAD_PREFIX") or None
+    # Server-side uploads are streamed to Cloudinary in chunks of this size (Cloudinary's minimum is 5 MB)
+    cloudinary_upload_chunk_bytes: int = int(os.getenv("CLOUDINARY_UPLOAD_CHUNK_BYTES", str(6 * 1024 * 1024)))
     
     # Environment
     environment: str = os.getenv("ENVIRONMENT", "development")
 
+    # In development, log a warning when one request runs the same SQL statement more than this many times
+    query_repeat_warning_threshold: int = int(os.getenv("QUERY_REPEAT_WARNING_THRESHOLD", "5"))
+
     # Paystack  ← ADD THIS BLOCK
     paystack_secret_key: str = os.getenv("PAYSTACK_SECRET_KEY")
     paystack_public_key: str = os.getenv("PAYSTACK_PUBLIC_KEY")
     payment_callback_url: str = os.getenv("PAYMENT_CALLBACK_URL")
+    paystack_base_url: str = os.getenv("PAYSTACK_BASE_URL", "https://api.paystack.co")
+
+    # Paystack HTTP client pool (per worker process)
+    paystack_timeout_seconds: float = float(os.getenv("PAYSTACK_TIMEOUT_SECONDS", "10"))
+    paystack_connect_timeout_seconds: float = float(os.getenv("PAYSTACK_CONNECT_TIMEOUT_SECONDS", "5"))
+    paystack_max_connections: int = int(os.getenv("PAYSTACK_MAX_CONNECTIONS", "20"))
+    paystack_max_keepalive_connections: int = int(os.getenv("PAYSTACK_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    paystack_keepalive_expiry_seconds: float = float(os.getenv("PAYSTACK_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    paystack_http2: bool = os.getenv("PAYSTACK_HTTP2", "true").lower() == "true"
 
     
     # CORS
@@ -49,6 +83,29 @@ class Settings(BaseSettings):
             return v
         return ["http://localhost:3000", "http://127.0.0.1:3000"]
     
+    # bcrypt process pool (per worker process)
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    password_hash_max_pending: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16"))
+    password_hash_retry_after_seconds: int = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "2"))
+
+    # Authenticated principal cache (per worker process)
+    principal_cache_size: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
+    principal_cache_ttl_seconds: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+
+    # Webhook inbox workers (threads per worker process)
+    webhook_worker_threads: int = int(os.getenv("WEBHOOK_WORKER_THREADS", "2"))
+    webhook_poll_interval_seconds: float = float(os.getenv("WEBHOOK_POLL_INTERVAL_SECONDS", "1"))
+    webhook_max_attempts: int = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "10"))
+    webhook_max_backoff_seconds: int = int(os.getenv("WEBHOOK_MAX_BACKOFF_SECONDS", "300"))
+
+    # Product catalog cache (per worker process)
+    product_cache_size: int = int(os.getenv("PRODUCT_CACHE_SIZE", "1024"))
+    product_cache_ttl_seconds: int = int(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "60"))
+
+    # HTTP caching of catalog reads (browsers and CDN)
+    catalog_cache_max_age_seconds: int = int(os.getenv("CATALOG_CACHE_MAX_AGE_SECONDS", "30"))
+    catalog_stale_while_revalidate_seconds: int = int(os.getenv("CATALOG_STALE_WHILE_REVALIDATE_SECONDS", "300"))
+
     # Gunicorn
     gunicorn_workers: int = int(os.getenv("GUNICORN_WORKERS", "3"))
     gunicorn_timeout: int = int(os.getenv("GUNICORN_TIMEOUT", "120"))
@@ -1,7 +1,7 @@
-from .auth import get_current_user, get_current_admin_user, create_access_token, verify_password, get_password_hash
+from .auth import get_current_user, get_current_admin_user, create_access_token, verify_password, get_password_hash, Principal
 from .security import security
 
 __all__ = [
     "get_current_user", "get_current_admin_user", "create_access_token", 
-    "verify_password", "get_password_hash", "security"
+    "verify_password", "get_password_hash", "Principal", "security"
 ]
@@ -1,26 +1,58 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import SessionLocal
 from app.models.user import User
 from app.config import settings
 from app.core.security import security
+from app.core.password_hashing import check_password, hash_password
+from app.core.invalidation import subscribe, subscribe_reset, USER_STATUS_CHANNEL
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as seen by route handlers: an immutable snapshot
+    of the columns authorization needs, safe to share between requests.
+    """
+    id: int
+    email: str
+    username: str
+    is_admin: bool
+    status: str
+
+
+# Per-process principal cache. Keys are (user_id, token iat), so a freshly
+# issued token always starts from the database.
+principal_cache = TTLCache(maxsize=settings.principal_cache_size, ttl=settings.principal_cache_ttl_seconds)
+
+
+def invalidate_principals(user_ids: Optional[List[int]] = None) -> None:
+    """Evict cached principals after a user's status or role changes."""
+    if not user_ids:
+        principal_cache.clear()
+        return
+    for user_id in user_ids:
+        principal_cache.delete_prefix(int(user_id))
+
+
+# Evict on changes made by other workers
+subscribe(USER_STATUS_CHANNEL, lambda payload: invalidate_principals(payload.get("user_ids")))
+subscribe_reset(principal_cache.clear)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    import bcrypt
-    return bcrypt.checkpw(plain_password[:72].encode('utf-8'), hashed_password.encode('utf-8'))
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    # Use bcrypt with explicit rounds and truncate to 72 bytes (bcrypt limit)
-    import bcrypt
-    salt = bcrypt.gensalt(rounds=12)
-    return bcrypt.hashpw(password[:72].encode('utf-8'), salt).decode('utf-8')
+    return hash_password(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -29,15 +61,33 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.jwt_access_token_expire_minutes)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
 
+def _load_principal(user_id: int) -> Optional[Principal]:
+    db = SessionLocal()
+    try:
+        row = db.query(
+            User.id, User.email, User.username, User.is_admin, User.status
+        ).filter(User.id == user_id).first()
+    finally:
+        db.close()
+    if row is None:
+        return None
+    return Principal(
+        id=row.id,
+        email=row.email,
+        username=row.username,
+        is_admin=row.is_admin,
+        status=row.status.value if row.status is not None else None,
+    )
+
+
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security), 
-    db: Session = Depends(get_db)
-) -> User:
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -46,19 +96,23 @@ async def get_current_user(
     try:
         token = credentials.credentials
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
         raise credentials_exception
-    return user
+
+    key = (user_id, payload.get("iat"))
+    principal = principal_cache.get(key)
+    if principal is None:
+        generation = principal_cache.generation
+        # Off the event loop: a cache miss must not stall other requests
+        principal = await run_in_threadpool(_load_principal, user_id)
+        if principal is None:
+            raise credentials_exception
+        principal_cache.set(key, principal, generation=generation)
+    return principal
 
 
-async def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,173 @@
+"""
+Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+Services call publish() inside their write transaction; Postgres delivers the
+NOTIFY only if that transaction commits. Every worker runs one listener thread
+on a dedicated connection and dispatches notifications to the handlers that
+caches register with subscribe(). If the listener connection drops, local
+caches fall back to TTL expiry until it reconnects, and reset handlers clear
+them on reconnect because notifications sent meanwhile are lost.
+"""
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CHANNEL = "vintique_catalog"
+STOCK_CHANNEL = "vintique_stock"
+USER_STATUS_CHANNEL = "vintique_user_status"
+CHANNELS = (CATALOG_CHANNEL, STOCK_CHANNEL, USER_STATUS_CHANNEL)
+
+_handlers: Dict[str, List[Callable[[dict], None]]] = defaultdict(list)
+_reset_handlers: List[Callable[[], None]] = []
+
+
+def subscribe(channel: str, handler: Callable[[dict], None]) -> None:
+    """Register a handler called with the decoded payload of each notification."""
+    _handlers[channel].append(handler)
+
+
+def subscribe_reset(handler: Callable[[], None]) -> None:
+    """Register a handler called when the listener (re)connects."""
+    _reset_handlers.append(handler)
+
+
+def publish(db: Session, channel: str, **payload) -> None:
+    """
+    Queue a NOTIFY in the session's current transaction.
+
+    Call before db.commit(): Postgres delivers it on commit and drops it on
+    rollback, so other workers never evict for a write that did not happen.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": json.dumps(payload)}
+    )
+
+
+def dispatch(channel: str, raw_payload: str) -> None:
+    try:
+        payload = json.loads(raw_payload) if raw_payload else {}
+    except ValueError:
+        logger.warning(f"Ignoring malformed invalidation payload on {channel}: {raw_payload!r}")
+        return
+    for handler in _handlers.get(channel, []):
+        try:
+            handler(payload)
+        except Exception as e:
+            logger.error(f"Invalidation handler failed on {channel}: {e}")
+
+
+def _reset_all() -> None:
+    for handler in _reset_handlers:
+        try:
+            handler()
+        except Exception as e:
+            logger.error(f"Invalidation reset handler failed: {e}")
+
+
+class InvalidationListener(threading.Thread):
+    """Background thread holding one LISTEN connection for this worker."""
+
+    poll_interval = 5.0
+    max_backoff = 30.0
+
+    def __init__(self, database_url: str):
+        super().__init__(name="cache-invalidation-listener", daemon=True)
+        # NullPool so the listener never occupies a slot in the request pool
+        self.engine = create_engine(database_url, poolclass=NullPool)
+        self.connected = False
+        self.notifications_received = 0
+        self.connections = 0
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            connection = None
+            try:
+                connection = self.engine.raw_connection()
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+                cursor = dbapi_connection.cursor()
+                for channel in CHANNELS:
+                    cursor.execute(f"LISTEN {channel}")
+
+                # Anything published while we were not listening was missed
+                _reset_all()
+                self.connected = True
+                self.connections += 1
+                backoff = 1.0
+                logger.info("Cache invalidation listener connected")
+
+                while not self._stop_event.is_set():
+                    ready, _, _ = select.select([dbapi_connection], [], [], self.poll_interval)
+                    if not ready:
+                        # Heartbeat so a silently dropped connection is noticed
+                        cursor.execute("SELECT 1")
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        notification = dbapi_connection.notifies.pop(0)
+                        self.notifications_received += 1
+                        dispatch(notification.channel, notification.payload)
+            except Exception as e:
+                if self.connected:
+                    logger.warning(f"Cache invalidation listener disconnected, caches fall back to TTL: {e}")
+                else:
+                    logger.warning(f"Cache invalidation listener could not connect: {e}")
+            finally:
+                self.connected = False
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+        self.engine.dispose()
+
+
+_listener: Optional[InvalidationListener] = None
+
+
+def start_listener(database_url: str) -> None:
+    """Start this worker's listener. Must run after fork, e.g. on app startup."""
+    global _listener
+    if _listener is not None and _listener.is_alive():
+        return
+    if not database_url or not database_url.startswith("postgresql"):
+        logger.info("Cache invalidation listener disabled: not a PostgreSQL database")
+        return
+    _listener = InvalidationListener(database_url)
+    _listener.start()
+
+
+def stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def listener_status() -> dict:
+    if _listener is None:
+        return {"running": False, "connected": False}
+    return {
+        "running": _listener.is_alive(),
+        "connected": _listener.connected,
+        "notifications_received": _listener.notifications_received,
+        "connections": _listener.connections,
+    }
@@ -0,0 +1,185 @@
+"""
+Prometheus instrumentation.
+
+Under gunicorn, PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py) and
+every worker writes its samples there, so a scrape of /metrics on any worker
+returns totals for all of them. Without it (uvicorn in development) metrics
+live in the default in-process registry.
+"""
+import os
+import re
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+REQUEST_LATENCY = Histogram(
+    "vintique_http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "vintique_http_requests_in_progress",
+    "Requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "vintique_http_request_db_queries",
+    "SQL statements issued per request",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "vintique_http_request_db_seconds",
+    "Time spent executing SQL per request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_LATENCY = Histogram(
+    "vintique_external_request_duration_seconds",
+    "Latency of calls to third-party services",
+    ["service", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    "vintique_password_hash_duration_seconds",
+    "bcrypt hash/verify latency including time queued for the pool",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "vintique_password_hash_rejected_total",
+    "bcrypt calls rejected with 503 because the pool was saturated",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "vintique_db_pool_connections",
+    "Connections per pool and state, summed over live workers",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+DB_REPLICA_LAG = Gauge(
+    "vintique_db_replica_lag_seconds",
+    "Replica replay lag at the last check (max over live workers)",
+    multiprocess_mode="livemax",
+)
+DB_REPLICA_USABLE = Gauge(
+    "vintique_db_replica_usable",
+    "1 while reads are routed to the replica (min over live workers)",
+    multiprocess_mode="livemin",
+)
+
+
+@dataclass
+class RequestStats:
+    """SQL activity of the request being handled."""
+    queries: int = 0
+    db_seconds: float = 0.0
+    # Executions per statement shape; only collected when repeats are being watched
+    statements: Optional[StatementCounter] = None
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes run more than threshold times, most frequent first."""
+        if not self.statements:
+            return []
+        return [(shape, count) for shape, count in self.statements.most_common() if count > threshold]
+
+
+_PLACEHOLDER = re.compile(r"%\([^)]*\)s|%s|\$\d+(?:::[\w\[\]]+)?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    SQL with bound parameters replaced by ?, so the same query for different
+    rows (and IN lists of any length) counts as one shape.
+    """
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+# Set by the request middleware; the threadpool copies context, so sync
+# routes and their sessions add to the same object
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+        if stats.statements is not None:
+            stats.statements[statement_shape(statement)] += 1
+
+
+def server_timing(stats: RequestStats, total_seconds: float) -> str:
+    """Server-Timing header value: SQL count and time, and the whole request."""
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f"app;dur={total_seconds * 1000:.1f}"
+    )
+
+
+@contextmanager
+def observe_external(service: str, operation: str):
+    """Time a call to a third-party service; outcome is ok or error."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        EXTERNAL_LATENCY.labels(service, operation, outcome).observe(time.perf_counter() - started)
+
+
+def record_pool_gauges() -> None:
+    """Publish this worker's pool and replica state."""
+    from app import database
+    from app.core.replica import replica_status
+
+    pools = {"sync": database.engine.pool, "async": database.async_engine.pool}
+    if database.replica_engine is not None:
+        pools["replica_sync"] = database.replica_engine.pool
+        pools["replica_async"] = database.async_replica_engine.pool
+    for name, pool in pools.items():
+        stats = database.pool_stats(pool)
+        for state in ("checked_out", "idle", "overflow"):
+            DB_POOL_CONNECTIONS.labels(name, state).set(stats[state])
+
+    replica = replica_status()
+    if replica["configured"]:
+        DB_REPLICA_USABLE.set(int(replica["usable"]))
+        if replica["lag_seconds"] is not None:
+            DB_REPLICA_LAG.set(replica["lag_seconds"])
+
+
+def render_metrics() -> tuple:
+    """Exposition body and content type for /metrics."""
+    # Refreshed at scrape time rather than per request
+    record_pool_gauges()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
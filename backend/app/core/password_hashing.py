@@ -0,0 +1,94 @@
+"""
+bcrypt hashing in a small, bounded process pool.
+
+bcrypt at 12 rounds is a few hundred milliseconds of pure CPU. Running it in
+the request worker starves every other endpoint during a login burst, so each
+worker process hands it to PASSWORD_HASH_WORKERS child processes instead. At
+most PASSWORD_HASH_MAX_PENDING calls may be queued or running per worker;
+beyond that callers get 503 with Retry-After rather than piling up.
+
+Without a started pool (scripts, migrations) hashing runs in-process.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core.metrics import PASSWORD_HASH_LATENCY, PASSWORD_HASH_REJECTED
+
+logger = logging.getLogger(__name__)
+
+BCRYPT_ROUNDS = 12
+
+_pool: Optional[ProcessPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+
+
+def hash_password_sync(password: str) -> str:
+    # Truncate to 72 bytes (bcrypt limit)
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password[:72].encode('utf-8'), salt).decode('utf-8')
+
+
+def check_password_sync(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password[:72].encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def _run(function, *args):
+    if _pool is None:
+        return function(*args)
+    if not _slots.acquire(blocking=False):
+        PASSWORD_HASH_REJECTED.inc()
+        logger.warning("Password hashing pool saturated, rejecting request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again shortly",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        )
+    try:
+        # Blocks this threadpool thread only; the CPU work happens in the child
+        return _pool.submit(function, *args).result()
+    finally:
+        _slots.release()
+
+
+def hash_password(password: str) -> str:
+    with PASSWORD_HASH_LATENCY.labels("hash").time():
+        return _run(hash_password_sync, password)
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    with PASSWORD_HASH_LATENCY.labels("verify").time():
+        return _run(check_password_sync, plain_password, hashed_password)
+
+
+def start_password_pool() -> None:
+    """Start this worker's hashing processes. Must run after fork, e.g. on app startup."""
+    global _pool, _slots
+    if _pool is not None or settings.password_hash_workers <= 0:
+        return
+    # spawn, not fork: the worker already runs threads (listeners, webhook workers)
+    _pool = ProcessPoolExecutor(
+        max_workers=settings.password_hash_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    _slots = threading.BoundedSemaphore(settings.password_hash_max_pending)
+    try:
+        # Start the children now so the first login does not pay for it
+        _pool.submit(hash_password_sync, "warmup").result()
+    except Exception as e:
+        logger.error(f"Password hashing pool failed to start, hashing in-process: {e}")
+        stop_password_pool()
+
+
+def stop_password_pool() -> None:
+    global _pool, _slots
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _slots = None
@@ -0,0 +1,112 @@
+"""
+Replica lag monitoring for read routing.
+
+One thread per worker asks the replica how far behind the primary it is and
+flips app.database.replica_state["usable"], which get_read_db and
+get_async_read_db consult on every request. Reads move back to the primary
+when the replica is unreachable, is not streaming from the primary, or lags
+more than REPLICA_MAX_LAG_SECONDS.
+"""
+import logging
+import threading
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.config import settings
+from app import database
+
+logger = logging.getLogger(__name__)
+
+# NULL unless the WAL receiver is streaming and has heard from the primary
+# within REPLICA_RECEIVER_TIMEOUT_SECONDS: a disconnected receiver stops
+# receiving, so "everything received is replayed" would otherwise read as no
+# lag forever. Then zero when the replica has replayed everything it received,
+# so an idle primary does not look like lag; otherwise the age of the last
+# replayed commit. The receiver status needs pg_read_all_stats (or superuser).
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver
+            WHERE status = 'streaming'
+              AND last_msg_receipt_time > now() - make_interval(secs => :receiver_timeout)
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaLagMonitor(threading.Thread):
+    def __init__(self):
+        super().__init__(name="replica-lag-monitor", daemon=True)
+        self.checks = 0
+        self.failures = 0
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def check(self) -> None:
+        try:
+            with database.replica_engine.connect() as connection:
+                lag = connection.execute(
+                    LAG_QUERY, {"receiver_timeout": settings.replica_receiver_timeout_seconds}
+                ).scalar()
+            if lag is None:
+                raise RuntimeError("WAL receiver is not streaming from the primary")
+            lag = float(lag)
+        except Exception as e:
+            self.failures += 1
+            if database.replica_state["usable"] or self.failures == 1:
+                logger.warning(f"Replica unreachable, reading from primary: {e}")
+            database.replica_state.update(usable=False, lag_seconds=None)
+            return
+
+        self.checks += 1
+        usable = lag <= settings.replica_max_lag_seconds
+        if usable != database.replica_state["usable"]:
+            if usable:
+                logger.info(f"Replica lag {lag:.1f}s, routing reads to replica")
+            else:
+                logger.warning(f"Replica lag {lag:.1f}s over {settings.replica_max_lag_seconds}s, reading from primary")
+        database.replica_state.update(usable=usable, lag_seconds=lag)
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            self.check()
+            self._stop_event.wait(settings.replica_lag_check_interval_seconds)
+
+
+_monitor: Optional[ReplicaLagMonitor] = None
+
+
+def start_replica_monitor() -> None:
+    """Start this worker's monitor if a replica is configured. Must run after fork."""
+    global _monitor
+    if database.replica_engine is None:
+        return
+    if _monitor is not None and _monitor.is_alive():
+        return
+    _monitor = ReplicaLagMonitor()
+    _monitor.start()
+
+
+def stop_replica_monitor() -> None:
+    global _monitor
+    if _monitor is not None:
+        _monitor.stop()
+        _monitor = None
+    database.replica_state.update(usable=False, lag_seconds=None)
+
+
+def replica_status() -> dict:
+    return {
+        "configured": database.replica_engine is not None,
+        "usable": database.replica_state["usable"],
+        "lag_seconds": database.replica_state["lag_seconds"],
+        "max_lag_seconds": settings.replica_max_lag_seconds,
+        "checks": _monitor.checks if _monitor else 0,
+        "failures": _monitor.failures if _monitor else 0,
+    }
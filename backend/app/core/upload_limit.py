@@ -0,0 +1,44 @@
+"""
+Early rejection of oversized multipart uploads.
+
+Starlette spools a whole multipart body to disk before the route runs, so a
+50 MB "image" would be received in full before validate_image_file refused
+it. This middleware answers 413 before reading any of the body when
+Content-Length is over the limit, and otherwise stops at the first chunk
+that takes the body over it.
+"""
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+
+
+class UploadSizeLimitMiddleware:
+    def __init__(self, app, max_body_bytes: int, detail: str = "Request body too large"):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.detail = detail
+
+    async def __call__(self, scope, receive, send):
+        headers = dict(scope.get("headers") or [])
+        if scope["type"] != "http" or not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            response = JSONResponse({"detail": self.detail}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # Raised inside form parsing, so the route's exception handling turns it into a 413
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=self.detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,128 @@
+"""
+Background settlement of Paystack webhooks from the webhook_events inbox.
+
+The webhook endpoint only records events. Each worker process runs a small
+pool of threads that claim the oldest due pending event with
+FOR UPDATE SKIP LOCKED, so threads and processes never work on the same
+event, and apply it in one transaction. A failed event is pushed back with
+exponential backoff and marked failed after WEBHOOK_MAX_ATTEMPTS.
+"""
+import logging
+import threading
+from datetime import timedelta
+from typing import List
+
+from sqlalchemy import func
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.webhook_event import WebhookEvent
+from app.services.product_service import invalidate_products
+from app.services.webhook_service import WebhookService
+
+logger = logging.getLogger(__name__)
+
+# Set by the endpoint after recording an event so idle threads wake at once
+_wakeup = threading.Event()
+
+
+def notify_new_event() -> None:
+    _wakeup.set()
+
+
+def process_next_event() -> bool:
+    """
+    Claim and apply one due event. Returns False if there was nothing to do.
+    """
+    db = SessionLocal()
+    try:
+        event = db.query(WebhookEvent).filter(
+            WebhookEvent.status == "pending",
+            WebhookEvent.available_at <= func.now()
+        ).order_by(WebhookEvent.available_at, WebhookEvent.id).with_for_update(skip_locked=True).first()
+        if event is None:
+            db.rollback()
+            return False
+
+        event.attempts += 1
+        try:
+            # Savepoint: a failure undoes the settlement but keeps the row
+            # lock, so the failed attempt is recorded in the same claim
+            with db.begin_nested():
+                product_ids = WebhookService(db).apply_event(event)
+        except Exception as e:
+            logger.error(f"Webhook event {event.event_key} failed (attempt {event.attempts}): {e}")
+            event.last_error = str(e)[:2000]
+            if event.attempts >= settings.webhook_max_attempts:
+                event.status = "failed"
+            else:
+                delay = min(2 ** event.attempts, settings.webhook_max_backoff_seconds)
+                event.available_at = func.now() + timedelta(seconds=delay)
+            db.commit()
+            return True
+
+        event.status = "processed"
+        event.processed_at = func.now()
+        event.last_error = None
+        db.commit()
+        if product_ids:
+            invalidate_products(product_ids)
+        return True
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class WebhookWorker(threading.Thread):
+    def __init__(self, index: int):
+        super().__init__(name=f"webhook-worker-{index}", daemon=True)
+        self.processed = 0
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                if process_next_event():
+                    self.processed += 1
+                    continue
+            except Exception as e:
+                logger.error(f"Webhook worker could not claim events: {e}")
+            _wakeup.wait(settings.webhook_poll_interval_seconds)
+            _wakeup.clear()
+
+
+_workers: List[WebhookWorker] = []
+
+
+def start_webhook_workers() -> None:
+    """Start this process's worker threads. Must run after fork, e.g. on app startup."""
+    if any(worker.is_alive() for worker in _workers):
+        return
+    if not settings.database_url or not settings.database_url.startswith("postgresql"):
+        logger.info("Webhook workers disabled: not a PostgreSQL database")
+        return
+    _workers.clear()
+    for index in range(settings.webhook_worker_threads):
+        worker = WebhookWorker(index)
+        worker.start()
+        _workers.append(worker)
+
+
+def stop_webhook_workers() -> None:
+    for worker in _workers:
+        worker.stop()
+    _wakeup.set()
+    _workers.clear()
+
+
+def webhook_worker_status() -> dict:
+    return {
+        "threads": len(_workers),
+        "alive": sum(1 for worker in _workers if worker.is_alive()),
+        "processed": sum(worker.processed for worker in _workers),
+    }
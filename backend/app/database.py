@@ -1,11 +1,55 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-engine = create_engine(settings.database_url)
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def async_database_url(url: str) -> str:
+    """The same database on the asyncpg driver, which spells sslmode as ssl."""
+    url = make_url(url).set(drivername="postgresql+asyncpg")
+    if "sslmode" in url.query:
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": url.query["sslmode"]})
+    return url.render_as_string(hide_password=False)
+
+
+engine = create_engine(settings.database_url, **_pool_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for read-heavy routes: a request waiting on Postgres holds no
+# threadpool slot. It has its own pool with the same limits as the sync one.
+async_engine = create_async_engine(async_database_url(settings.database_url), **_pool_options())
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Optional streaming replica for read-only listings. app.core.replica checks
+# its lag in the background and reads fall back to the primary while the
+# replica is unreachable or too far behind.
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+if settings.database_replica_url:
+    replica_engine = create_engine(settings.database_replica_url, **_pool_options())
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    async_replica_engine = create_async_engine(async_database_url(settings.database_replica_url), **_pool_options())
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+# Set by the replica lag monitor; reads never go to the replica until it has been checked
+replica_state = {"usable": False, "lag_seconds": None}
+
 Base = declarative_base()
 
 
@@ -15,3 +59,50 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db():
+    """
+    Session for read-only routes that tolerate replica lag. Never use it for
+    writes or for reads that must see the caller's own recent writes.
+    """
+    factory = ReplicaSessionLocal if replica_state["usable"] else SessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    """get_read_db() for async routes."""
+    factory = AsyncReplicaSessionLocal if replica_state["usable"] else AsyncSessionLocal
+    async with factory() as db:
+        yield db
+
+
+def dispose_engines(close: bool = True) -> None:
+    """Reset every pool, e.g. after fork with close=False."""
+    engine.dispose(close=close)
+    async_engine.sync_engine.dispose(close=close)
+    if replica_engine is not None:
+        replica_engine.dispose(close=close)
+        async_replica_engine.sync_engine.dispose(close=close)
+
+
+def pool_stats(pool=None) -> dict:
+    """Connection counts for one of this worker's pools (the sync one by default)."""
+    pool = pool or engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # QueuePool counts overflow from -pool_size; only connections beyond pool_size are overflow
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.db_max_overflow,
+    }
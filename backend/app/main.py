@@ -3,10 +3,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import logging
 import time
+from collections import Counter
 
-from app.routes import auth_router, product_router, cart_router, order_router, admin_router, health_router, payment_router
+from app.routes import auth_router, product_router, cart_router, order_router, admin_router, health_router, payment_router, metrics_router
 from app.routes.admin import inventory_router
 from app.config import settings
+from app.core.invalidation import start_listener, stop_listener
+from app.core.metrics import (
+    RequestStats, current_request_stats, REQUEST_LATENCY, REQUESTS_IN_PROGRESS,
+    REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, server_timing
+)
+from app.core.replica import start_replica_monitor, stop_replica_monitor
+from app.core.upload_limit import UploadSizeLimitMiddleware
+from app.core.password_hashing import start_password_pool, stop_password_pool
+from app.core.webhook_worker import start_webhook_workers, stop_webhook_workers
+from app.services.payment_service import close_clients as close_payment_clients
+from app.utils.cloudinary import MAX_FILE_SIZE
 
 # Configure logging
 logging.basicConfig(
@@ -38,24 +50,100 @@ else:
         "https://vintique-one.vercel.app",
     ]
 
+# Refuse oversized image uploads before receiving them; added before CORS so
+# the 413 still carries CORS headers. The margin covers the other form fields.
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_bytes=MAX_FILE_SIZE + 64 * 1024,
+    detail="File too large. Maximum size: 10MB",
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Process-Time"],
+    expose_headers=["X-Process-Time", "Server-Timing", "ETag", "Retry-After"],
 )
 
 # Add request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+    # Statement shapes are only tracked in development, to catch N+1 queries
+    stats = RequestStats(statements=Counter() if settings.environment == "development" else None)
+    token = current_request_stats.set(stats)
+    in_progress = REQUESTS_IN_PROGRESS.labels(request.method)
+    in_progress.inc()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        in_progress.dec()
+        current_request_stats.reset(token)
+        process_time = time.time() - start_time
+        # Label by route template, not raw path, to keep label cardinality bounded
+        route = request.scope.get("route")
+        route_label = route.path if route is not None else "<unmatched>"
+        REQUEST_LATENCY.labels(request.method, route_label, str(status_code)).observe(process_time)
+        REQUEST_DB_QUERIES.labels(route_label).observe(stats.queries)
+        REQUEST_DB_SECONDS.labels(route_label).observe(stats.db_seconds)
+    for shape, count in stats.repeated_statements(settings.query_repeat_warning_threshold):
+        logger.warning(f"Possible N+1: {request.method} {route_label} ran this statement {count} times: {shape[:300]}")
     response.headers["X-Process-Time"] = str(process_time)
+    response.headers["Server-Timing"] = server_timing(stats, process_time)
     return response
 
+# Each worker listens for cache invalidations from the others
+@app.on_event("startup")
+def start_cache_invalidation_listener():
+    start_listener(settings.database_url)
+
+
+@app.on_event("shutdown")
+def stop_cache_invalidation_listener():
+    stop_listener()
+
+
+# Each worker checks replica lag before routing reads to it
+@app.on_event("startup")
+def start_replica_lag_monitor():
+    start_replica_monitor()
+
+
+@app.on_event("shutdown")
+def stop_replica_lag_monitor():
+    stop_replica_monitor()
+
+
+# Each worker hashes passwords in its own small process pool
+@app.on_event("startup")
+def start_password_hashing_pool():
+    start_password_pool()
+
+
+@app.on_event("shutdown")
+def stop_password_hashing_pool():
+    stop_password_pool()
+
+
+# Each worker settles queued Paystack webhooks in background threads
+@app.on_event("startup")
+def start_webhook_processing():
+    start_webhook_workers()
+
+
+@app.on_event("shutdown")
+def stop_webhook_processing():
+    stop_webhook_workers()
+
+
+@app.on_event("shutdown")
+async def close_payment_provider_connections():
+    await close_payment_clients()
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -74,6 +162,7 @@ app.include_router(admin_router)
 app.include_router(inventory_router)
 app.include_router(health_router)
 app.include_router(payment_router)
+app.include_router(metrics_router)
 
 @app.get("/")
 async def root():
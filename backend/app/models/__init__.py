@@ -2,5 +2,6 @@ from .user import User, Account, Guest
 from .product import Product
 from .cart import Cart
 from .order import Order, Transaction
+from .webhook_event import WebhookEvent
 
-__all__ = ["User", "Account", "Guest", "Product", "Cart", "Order", "Transaction"]
+__all__ = ["User", "Account", "Guest", "Product", "Cart", "Order", "Transaction", "WebhookEvent"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -6,6 +6,11 @@ from app.database import Base
 
 class Cart(Base):
     __tablename__ = "cart"
+    __table_args__ = (
+        # One row per product per cart (upsert target); leading user_id
+        # also serves per-user cart lookups
+        UniqueConstraint("user_id", "product_id", name="uq_cart_user_id_product_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -1,10 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Boolean
+from sqlalchemy import Column, Computed, Index, text, Integer, String, Text, DateTime, Numeric, Boolean
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.database import Base
 
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_products_created_at_id", "created_at", "id"),
+        # Catalog listing only ever reads live products
+        Index("ix_products_live_created_at_id", "created_at", "id", postgresql_where=text("is_deleted = false")),
+        # Full-text and trigram search
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_products_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -15,3 +26,13 @@ class Product(Base):
     is_deleted = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Maintained by Postgres as a generated column; deferred so normal reads skip it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
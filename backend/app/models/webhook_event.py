@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Index, Integer, String, DateTime, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class WebhookEvent(Base):
+    """
+    Inbox of received Paystack webhooks. The endpoint only records events;
+    background workers claim pending rows and settle them.
+    """
+    __tablename__ = "webhook_events"
+    __table_args__ = (
+        # Workers claim the oldest due pending event
+        Index(
+            "ix_webhook_events_pending",
+            "available_at", "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # "<event>:<paystack transaction id or reference>"; Paystack retries reuse it
+    event_key = Column(String(255), nullable=False, unique=True)
+    event_type = Column(String(100), nullable=False)
+    reference = Column(String(255), nullable=True)
+    payload = Column(JSONB, nullable=False)
+    status = Column(String(20), default="pending", nullable=False)  # pending, processed, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    # Not claimed before this time; pushed back after a failed attempt
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True)
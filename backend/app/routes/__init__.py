@@ -5,4 +5,5 @@ from .orders import order_router
 from .admin import admin_router
 from .health import health_router
 from .payment import payment_router
-__all__ = ["auth_router", "product_router", "cart_router", "order_router", "admin_router", "health_router", "payment_router"]
+from .metrics import metrics_router
+__all__ = ["auth_router", "product_router", "cart_router", "order_router", "admin_router", "health_router", "payment_router", "metrics_router"]
@@ -1,17 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Union, Optional
 from pydantic import BaseModel
 
-from app.database import get_db
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.database import get_db, get_read_db
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ImageUploadSignature
 from app.schemas.user import UserResponse
-from app.schemas.order import OrderResponse
-from app.services.product_service import ProductService
+from app.schemas.order import OrderResponse, OrderBulkStatusUpdate, OrderBulkStatusResult
+from app.schemas.pagination import Page
+from app.services.product_service import ProductService, product_cache
 from app.services.user_service import UserService
 from app.services.order_service import OrderService
-from app.core.auth import get_current_admin_user
+from app.core.auth import get_current_admin_user, Principal, principal_cache, invalidate_principals
+from app.core.invalidation import publish, listener_status, USER_STATUS_CHANNEL
+from app.core.webhook_worker import webhook_worker_status
+from app.core.replica import replica_status
+from app.models.webhook_event import WebhookEvent
 from app.models.user import User
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.cloudinary import sign_image_upload, uploaded_image_url
 
 admin_router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -26,38 +34,86 @@ class UserAccountAction(BaseModel):
     reason: Optional[str] = None  # Optional reason for the action
 
 
-@admin_router.get("/orders", response_model=List[OrderResponse])
+@admin_router.get("/orders", response_model=Page[OrderResponse])
 def get_all_orders(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    order_service = OrderService(db)
+    items, next_cursor = order_service.get_all_orders(limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@admin_router.patch("/orders/status", response_model=OrderBulkStatusResult)
+def bulk_update_order_status(
+    payload: OrderBulkStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
+    """
+    Move many orders to one status in a single statement, e.g. mark a
+    fulfilment batch shipped. Orders that are missing or not in an allowed
+    source status are returned as skipped.
+    """
     order_service = OrderService(db)
-    return order_service.get_all_orders()
+    updated = order_service.transition_orders(payload.order_ids, payload.status, payload.from_statuses)
+    updated_ids = set(updated)
+    skipped = [order_id for order_id in dict.fromkeys(payload.order_ids) if order_id not in updated_ids]
+    return {"status": payload.status, "updated": updated, "skipped": skipped}
 
 
-@admin_router.get("/users", response_model=List[UserResponse])
+@admin_router.get("/users", response_model=Page[UserResponse])
 def get_all_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     user_service = UserService(db)
-    return user_service.get_all_users()
+    items, next_cursor = user_service.get_all_users(limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
 
 
-@admin_router.get("/products", response_model=List[ProductResponse])
+@admin_router.get("/products", response_model=Page[ProductResponse])
 def get_all_products_admin(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     product_service = ProductService(db)
-    return product_service.get_all_products()
+    items, next_cursor = product_service.get_all_products(limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@admin_router.get("/cache/stats", response_model=dict)
+def get_cache_stats(current_user: Principal = Depends(get_current_admin_user)):
+    """Per-worker cache counters, for sizing the *_CACHE_SIZE/TTL settings."""
+    return {
+        "products": product_cache.stats(),
+        "principals": principal_cache.stats(),
+        "invalidation_listener": listener_status(),
+        "replica": replica_status(),
+    }
+
+
+@admin_router.get("/webhooks/stats", response_model=dict)
+def get_webhook_stats(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Inbox backlog by status plus this worker's settlement threads."""
+    counts = db.query(WebhookEvent.status, func.count(WebhookEvent.id)).group_by(WebhookEvent.status).all()
+    return {"events": dict(counts), "workers": webhook_worker_status()}
 
 
 @admin_router.patch("/users/{identifier}/make-admin", response_model=UserResponse)
 def make_user_admin(
     identifier: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
    
     
@@ -82,7 +138,9 @@ def make_user_admin(
         )
 
     user.is_admin = True
+    publish(db, USER_STATUS_CHANNEL, user_ids=[user.id])
     db.commit()
+    invalidate_principals([user.id])
     db.refresh(user)
 
     return user
@@ -92,7 +150,7 @@ def make_user_admin(
 def manage_user_account(
     action_data: UserAccountAction,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     user_service = UserService(db)
 
@@ -114,23 +172,57 @@ def manage_user_account(
 inventory_router = APIRouter(prefix="/inventory", tags=["inventory"])
 
 
+def _uploaded_image_url(public_id: Optional[str], version: Optional[int], signature: Optional[str]) -> Optional[str]:
+    """Verified URL of a direct Cloudinary upload, or None if the form did not name one."""
+    if not public_id:
+        return None
+    if version is None or not signature:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="image_version and image_signature are required with image_public_id"
+        )
+    try:
+        return uploaded_image_url(public_id, version, signature)
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
+
+
+@inventory_router.post("/product/image-signature", response_model=ImageUploadSignature)
+def sign_product_image_upload(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Sign a direct upload of a product image to Cloudinary.
+    
+    Post the image to upload_url with the other returned fields, then create
+    or update the product with image_public_id, image_version and
+    image_signature from Cloudinary's response instead of image_file.
+    """
+    return sign_image_upload()
+
+
 @inventory_router.post("/product", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 def create_product(
     name: str = Form(..., description="Product name (required)"),
     description: str = Form(None, description="Product description (optional)"),
     price: float = Form(..., description="Product price (required)"),
     stock_quantity: int = Form(..., description="Stock quantity (required)"),
-    image_file: UploadFile = File(..., description="Product image (required)"),
+    image_file: UploadFile = File(None, description="Product image, unless it was uploaded to Cloudinary directly"),
+    image_public_id: str = Form(None, description="public_id of a signed direct upload"),
+    image_version: int = Form(None, description="version of a signed direct upload"),
+    image_signature: str = Form(None, description="signature of a signed direct upload"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Create a new product with image upload.
     
-    Image upload is required and will be validated for:
-    - File type (jpg, jpeg, png, webp only)
-    - File size (max 5MB)
-    - MIME type validation
+    An image is required, either as image_file or as a direct Cloudinary
+    upload signed by /inventory/product/image-signature. Files are
+    validated for:
+    - File size (max 10MB, refused before the body is read)
+    - File type (JPEG, PNG or WebP, from the file's magic bytes)
+    - Dimensions (read from the image header)
     """
     from decimal import Decimal
     import logging
@@ -156,8 +248,9 @@ def create_product(
                 detail="Stock quantity cannot be negative"
             )
         
-        # Validate image file is provided
-        if not image_file or not image_file.filename:
+        # Validate an image is provided
+        image_url = _uploaded_image_url(image_public_id, image_version, image_signature)
+        if not image_url and (not image_file or not image_file.filename):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Product image is required"
@@ -165,19 +258,21 @@ def create_product(
         
         # Create product data object
         class ProductData:
-            def __init__(self, name, description, price, stock_quantity, image_file):
+            def __init__(self, name, description, price, stock_quantity, image_file, image_url):
                 self.name = name.strip()
                 self.description = description.strip() if description else None
                 self.price = Decimal(str(price))
                 self.stock_quantity = stock_quantity
-                self.image_file = image_file
+                self.image_file = None if image_url else image_file
+                self.image_url = image_url
         
         product_data = ProductData(
             name=name,
             description=description,
             price=price,
             stock_quantity=stock_quantity,
-            image_file=image_file
+            image_file=image_file,
+            image_url=image_url
         )
         
         # Create product using service
@@ -212,8 +307,11 @@ def update_product(
     price: float = Form(None),
     stock_quantity: int = Form(None),
     image_file: UploadFile = File(None),
+    image_public_id: str = Form(None, description="public_id of a signed direct upload"),
+    image_version: int = Form(None, description="version of a signed direct upload"),
+    image_signature: str = Form(None, description="signature of a signed direct upload"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     from app.schemas.product import ProductUpdate
     from decimal import Decimal
@@ -230,16 +328,17 @@ def update_product(
         update_data["stock_quantity"] = stock_quantity
     
     product_data = ProductUpdate(**update_data)
+    image_url = _uploaded_image_url(image_public_id, image_version, image_signature)
     
     product_service = ProductService(db)
-    return product_service.update_product(product_id, product_data, image_file)
+    return product_service.update_product(product_id, product_data, None if image_url else image_file, image_url)
 
 
 @inventory_router.delete("/product/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_product(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     product_service = ProductService(db)
     product_service.delete_product(product_id)
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.database import get_db
-from app.schemas.cart import CartCreate, CartUpdate, CartResponse
+from app.database import get_db, get_async_db
+from app.schemas.cart import CartCreate, CartUpdate, CartResponse, CartDetailResponse, CartBatchRequest
 from app.services.cart_service import CartService
-from app.core.auth import get_current_user
-from app.models.user import User
+from app.core.auth import get_current_user, Principal
 
 cart_router = APIRouter(prefix="/cart", tags=["cart"])
 
@@ -15,7 +15,7 @@ cart_router = APIRouter(prefix="/cart", tags=["cart"])
 def add_to_cart(
     cart_data: CartCreate, 
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[Principal] = Depends(get_current_user)
 ):
     cart_service = CartService(db)
     user_id = current_user.id if current_user else None
@@ -27,28 +27,56 @@ def update_cart_quantity(
     cart_item_id: int,
     cart_data: CartUpdate,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[Principal] = Depends(get_current_user)
 ):
     cart_service = CartService(db)
     user_id = current_user.id if current_user else None
     return cart_service.update_cart_item(cart_item_id, cart_data, user_id)
 
 
-@cart_router.get("/", response_model=List[CartResponse])
-def get_cart_items(
+@cart_router.get("/", response_model=CartDetailResponse)
+async def get_cart_items(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Cart lines with product name, price, image, line totals and stock
+    availability, plus the cart total, from one database query.
+    """
+    cart_service = CartService(db)
+    return await cart_service.get_cart_details_async(current_user.id)
+
+
+@cart_router.post("/batch", response_model=CartDetailResponse)
+def apply_cart_batch(
+    batch: CartBatchRequest,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
+    """
+    Apply a list of add/update/remove operations keyed by product_id in one
+    transaction, and return the resulting cart. "update" sets the quantity,
+    "add" increments it.
+    """
     cart_service = CartService(db)
-    user_id = current_user.id if current_user else None
-    return cart_service.get_cart_items(user_id)
+    cart_service.apply_batch(batch.operations, current_user.id)
+    return cart_service.get_cart_details(current_user.id)
+
+
+@cart_router.post("/clear", status_code=status.HTTP_204_NO_CONTENT)
+def clear_cart(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    cart_service = CartService(db)
+    cart_service.clear_cart(current_user.id)
 
 
 @cart_router.delete("/{cart_item_id}", status_code=status.HTTP_204_NO_CONTENT)
 def remove_from_cart(
     cart_item_id: int,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[Principal] = Depends(get_current_user)
 ):
     cart_service = CartService(db)
     user_id = current_user.id if current_user else None
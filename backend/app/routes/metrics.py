@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_metrics
+
+metrics_router = APIRouter(tags=["metrics"])
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus exposition for every worker: request latency by route,
+    in-flight requests, SQL per request, Paystack/Cloudinary/bcrypt latency,
+    and connection pool and replica gauges.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.database import get_db
+from app.database import get_db, get_async_read_db
 from app.schemas.order import OrderCreate, OrderResponse
 from app.services.order_service import OrderService
 from app.services.payment_service import initialize_payment
-from app.core.auth import get_current_user
-from app.models.user import User
+from app.core.auth import get_current_user, Principal
 from app.models.order import Transaction
+from app.utils.http_cache import weak_etag, conditional_response, PRIVATE_REVALIDATE
 
 
 order_router = APIRouter(prefix="/orders", tags=["orders"])
@@ -18,7 +19,7 @@ order_router = APIRouter(prefix="/orders", tags=["orders"])
 def checkout(
     order_data: OrderCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     # Create orders
     order_service = OrderService(db)
@@ -39,9 +40,8 @@ def checkout(
 
     # Handle Paystack initialization failure
     if not payment["status"]:
-        # Rollback created orders if payment initialization fails
-        for order in created_orders:
-            order_service.update_order_status(order.id, "failed")
+        # Mark the created orders failed if payment initialization fails
+        order_service.transition_orders(order_ids, "failed")
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Payment initialization failed: {payment['message']}"
@@ -71,19 +71,29 @@ def checkout(
 
 
 @order_router.get("/history", response_model=List[OrderResponse])
-def get_order_history(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_order_history(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     order_service = OrderService(db)
-    return order_service.get_user_orders(current_user.id)
+
+    # Cheap aggregate first, so an unchanged history never loads the rows
+    latest, count = await order_service.get_user_orders_version_async(current_user.id)
+    etag = weak_etag(latest, current_user.id, count)
+    not_modified = conditional_response(request, response, etag, PRIVATE_REVALIDATE)
+    if not_modified:
+        return not_modified
+
+    return await order_service.get_user_orders_async(current_user.id)
 
 
 @order_router.get("/{order_id}", response_model=OrderResponse)
 def get_order(
     order_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get order by ID with proper authorization.
@@ -2,16 +2,19 @@ import hmac
 import hashlib
 import json
 import logging
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.config import settings
 from app.models.order import Transaction
-from app.services.order_service import OrderService
-from app.services.payment_service import verify_payment
+from app.services.webhook_service import WebhookService
+from app.core.webhook_worker import notify_new_event
+from app.services.payment_service import verify_payment_async
 
 logger = logging.getLogger(__name__)
 
@@ -39,62 +42,21 @@ async def paystack_webhook(request: Request, db: Session = Depends(get_db)):
             detail="Invalid signature"
         )
 
-    event = json.loads(payload)
-    event_type = event.get("event")
-    data = event.get("data", {})
-
-    logger.info(f"Paystack webhook received: {event_type}")
-
-    if event_type == "charge.success":
-        reference = data.get("reference")
-        order_ids = data.get("metadata", {}).get("order_ids", [])
-        amount_naira = data.get("amount", 0) / 100
-        channel = data.get("channel", "")
-        paid_at_str = data.get("paid_at")
-        paid_at = datetime.strptime(paid_at_str, "%Y-%m-%dT%H:%M:%S.%fZ") if paid_at_str else None
-
-        if not order_ids:
-            logger.error(f"Webhook missing order_ids in metadata for reference {reference}")
-            return {"status": "ok"}
-
-        order_service = OrderService(db)
-
-        # Step 1 — Find ALL transactions with this reference and update them
-        transactions = db.query(Transaction).filter(
-            Transaction.reference == reference
-        ).all()
-
-        if transactions:
-            for transaction in transactions:
-                transaction.status = "success"
-                transaction.channel = channel
-                transaction.paid_at = paid_at
-            db.commit()
-            logger.info(f"Updated {len(transactions)} transactions to success for reference {reference}")
-        else:
-            # Fallback — only create if order actually exists
-            logger.warning(f"No pending transaction found for reference {reference}, creating new one")
-            for order_id in order_ids:
-                transaction = Transaction(
-                    order_id=order_id,
-                    reference=reference,
-                    status="success",
-                    amount=amount_naira,
-                    currency=data.get("currency", "NGN"),
-                    channel=channel,
-                    paid_at=paid_at
-                )
-                db.add(transaction)
-            db.commit()
-
-        # Step 2 — Update orders to paid AFTER transaction confirmed
-        for order_id in order_ids:
-            order_service.update_order_status(order_id, "paid")
-
-        # Step 3 — Deduct stock last
-        order_service.deduct_stock(order_ids)
-
-        logger.info(f"Payment confirmed for orders {order_ids}, reference {reference}")
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid payload"
+        )
+
+    # Only record the event here; webhook workers settle it in the background,
+    # so Paystack gets its 200 quickly and retries are deduplicated. The insert
+    # runs off the event loop so a burst of webhooks cannot stall other requests
+    recorded = await run_in_threadpool(WebhookService(db).record_event, event)
+    if recorded:
+        notify_new_event()
+    logger.info(f"Paystack webhook received: {event.get('event')} ({'queued' if recorded else 'duplicate'})")
 
     return {"status": "ok"}
 
@@ -102,7 +64,7 @@ async def paystack_webhook(request: Request, db: Session = Depends(get_db)):
 @payment_router.get("/verify/{reference}")
 async def verify_payment_status(
     reference: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Verifies payment status by reference.
@@ -110,7 +72,7 @@ async def verify_payment_status(
     Confirms payment with Paystack AND cross-checks with our database.
     """
     # Step 1 — Confirm with Paystack
-    result = verify_payment(reference)
+    result = await verify_payment_async(reference)
 
     if not result["status"]:
         raise HTTPException(
@@ -119,9 +81,9 @@ async def verify_payment_status(
         )
 
     # Step 2 — Cross check with our database
-    transactions = db.query(Transaction).filter(
-        Transaction.reference == reference
-    ).all()
+    transactions = (await db.scalars(
+        select(Transaction).where(Transaction.reference == reference)
+    )).all()
 
     order_ids = [t.order_id for t in transactions]
     db_status = transactions[0].status if transactions else "not_found"
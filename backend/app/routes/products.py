@@ -1,35 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from app.database import get_db
+from app.database import get_async_db, get_async_read_db
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.schemas.pagination import Page
 from app.services.product_service import ProductService
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.http_cache import weak_etag, conditional_response, public_cache_control
+from app.config import settings
 
 product_router = APIRouter(prefix="/products", tags=["products"])
 
+CATALOG_CACHE_CONTROL = public_cache_control(
+    settings.catalog_cache_max_age_seconds,
+    settings.catalog_stale_while_revalidate_seconds
+)
 
-@product_router.get("/", response_model=List[ProductResponse])
-def get_all_products(db: Session = Depends(get_db)):
+
+@product_router.get("/", response_model=Page[ProductResponse])
+async def get_all_products(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Cache misses read the primary: a lagging replica would refill the cache
+    # with rows an invalidating write just replaced
+    product_service = ProductService(db)
+    items, next_cursor = await product_service.get_all_products_async(limit, cursor)
+
+    etag = weak_etag(
+        max((item.updated_at for item in items), default=None),
+        [item.id for item in items],
+        next_cursor
+    )
+    not_modified = conditional_response(request, response, etag, CATALOG_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@product_router.get("/search", response_model=Page[ProductResponse])
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=100, description="Search text"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
     product_service = ProductService(db)
-    return product_service.get_all_products()
+    items, next_cursor = await product_service.search_products_async(q.strip(), limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @product_router.get("/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)):
+async def get_product(product_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    # Primary for the same reason as get_all_products
     product_service = ProductService(db)
-    product = product_service.get_product_by_id(product_id)
+    product = await product_service.get_cached_product_async(product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
+
+    etag = weak_etag(product.updated_at, product.id)
+    not_modified = conditional_response(request, response, etag, CATALOG_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
     return product
 
 @product_router.get("/name/{product_name}", response_model=ProductResponse)
-def get_product_by_name(product_name: str, db: Session = Depends(get_db)):
+async def get_product_by_name(product_name: str, db: AsyncSession = Depends(get_async_read_db)):
     product_service = ProductService(db)
-    product = product_service.get_product_by_name(product_name)
+    product = await product_service.get_product_by_name_async(product_name)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,13 +1,14 @@
 from .user import UserCreate, UserLogin, UserResponse, AccountResponse
-from .product import ProductCreate, ProductUpdate, ProductResponse
-from .cart import CartCreate, CartUpdate, CartResponse
-from .order import OrderCreate, OrderResponse, TransactionResponse
+from .product import ProductCreate, ProductUpdate, ProductResponse, ImageUploadSignature
+from .cart import CartCreate, CartUpdate, CartResponse, CartDetailResponse, CartBatchRequest
+from .order import OrderCreate, OrderResponse, OrderBulkStatusUpdate, OrderBulkStatusResult, TransactionResponse
 from .auth import Token
+from .pagination import Page
 
 __all__ = [
     "UserCreate", "UserLogin", "UserResponse", "AccountResponse",
-    "ProductCreate", "ProductUpdate", "ProductResponse",
-    "CartCreate", "CartUpdate", "CartResponse",
-    "OrderCreate", "OrderResponse", "TransactionResponse",
-    "Token"
+    "ProductCreate", "ProductUpdate", "ProductResponse", "ImageUploadSignature",
+    "CartCreate", "CartUpdate", "CartResponse", "CartDetailResponse", "CartBatchRequest",
+    "OrderCreate", "OrderResponse", "OrderBulkStatusUpdate", "OrderBulkStatusResult", "TransactionResponse",
+    "Token", "Page"
 ]
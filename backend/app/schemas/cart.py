@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
 from datetime import datetime
+from decimal import Decimal
 
 
 class CartCreate(BaseModel):
@@ -12,6 +13,23 @@ class CartUpdate(BaseModel):
     quantity: int = Field(..., gt=0)
 
 
+class CartOperation(BaseModel):
+    op: Literal["add", "update", "remove"]
+    product_id: int = Field(..., gt=0)
+    quantity: Optional[int] = Field(None, gt=0)
+
+    @model_validator(mode='after')
+    def validate_quantity(self):
+        """add and update need a quantity; remove ignores it."""
+        if self.op != "remove" and self.quantity is None:
+            raise ValueError(f"quantity is required for '{self.op}'")
+        return self
+
+
+class CartBatchRequest(BaseModel):
+    operations: List[CartOperation] = Field(..., min_length=1, max_length=100)
+
+
 class CartResponse(BaseModel):
     id: int
     user_id: Optional[int] = None
@@ -22,3 +40,28 @@ class CartResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CartProductSummary(BaseModel):
+    id: int
+    name: str
+    price: Decimal
+    image_url: Optional[str] = None
+    stock_quantity: int
+
+
+class CartLineResponse(BaseModel):
+    id: int
+    product_id: int
+    quantity: int
+    line_total: Decimal
+    in_stock: bool
+    product: CartProductSummary
+    created_at: datetime
+    updated_at: datetime
+
+
+class CartDetailResponse(BaseModel):
+    items: List[CartLineResponse]
+    total: Decimal
+    item_count: int
@@ -20,7 +20,7 @@ class OrderItem(BaseModel):
 
 
 class OrderCreate(BaseModel):
-    items: List[OrderItem]
+    items: List[OrderItem] = Field(..., min_length=1, description="At least one item required")
     shipping_address: str = Field(..., min_length=1, max_length=500, description="Shipping address")
 
 
@@ -40,6 +40,20 @@ class OrderResponse(BaseModel):
         from_attributes = True
 
 
+class OrderBulkStatusUpdate(BaseModel):
+    order_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    status: str = Field(..., description="Target status, e.g. shipped")
+    from_statuses: Optional[List[str]] = Field(
+        None, description="Only move orders in these statuses (defaults to every allowed source)"
+    )
+
+
+class OrderBulkStatusResult(BaseModel):
+    status: str
+    updated: List[int]
+    skipped: List[int]
+
+
 class TransactionResponse(BaseModel):
     id: int
     order_id: int
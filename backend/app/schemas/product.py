@@ -86,3 +86,13 @@ class ProductResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ImageUploadSignature(BaseModel):
+    """Fields for a signed direct upload to Cloudinary; post all but upload_url with the file."""
+    upload_url: str
+    api_key: str
+    timestamp: int
+    folder: str
+    allowed_formats: str
+    signature: str
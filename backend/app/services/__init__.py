@@ -3,5 +3,6 @@ from .product_service import ProductService
 from .cart_service import CartService
 from .order_service import OrderService
 from .auth_service import AuthService
+from .webhook_service import WebhookService
 
-__all__ = ["UserService", "ProductService", "CartService", "OrderService", "AuthService"]
+__all__ = ["UserService", "ProductService", "CartService", "OrderService", "AuthService", "WebhookService"]
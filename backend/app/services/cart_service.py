@@ -1,14 +1,17 @@
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from fastapi import HTTPException, status
 
 from app.models.cart import Cart
 from app.models.product import Product
-from app.schemas.cart import CartCreate, CartUpdate
+from app.schemas.cart import CartCreate, CartUpdate, CartOperation
 
 
 class CartService:
-    def __init__(self, db: Session):
+    # The *_async read methods need an AsyncSession; everything else a Session
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
 
     def get_cart_items(self, user_id: Optional[int] = None) -> List[Cart]:
@@ -17,77 +20,188 @@ class CartService:
             query = query.filter(Cart.user_id == user_id)
         return query.all()
 
+    def get_cart_details(self, user_id: int) -> dict:
+        """
+        Cart lines joined with their products in a single query.
+
+        Line totals, the cart total (window sum) and the per-line
+        availability flag are all computed by Postgres.
+        """
+        rows = self.db.execute(self._cart_details_statement(user_id)).all()
+        return self._cart_details(rows)
+
+    async def get_cart_details_async(self, user_id: int) -> dict:
+        """get_cart_details() on an AsyncSession."""
+        rows = (await self.db.execute(self._cart_details_statement(user_id))).all()
+        return self._cart_details(rows)
+
+    @staticmethod
+    def _cart_details_statement(user_id: int):
+        line_total = (Product.price * Cart.quantity).label("line_total")
+        return select(
+            Cart.id,
+            Cart.product_id,
+            Cart.quantity,
+            Cart.created_at,
+            Cart.updated_at,
+            Product.name,
+            Product.price,
+            Product.image_url,
+            Product.stock_quantity,
+            line_total,
+            and_(Product.is_deleted == False, Product.stock_quantity >= Cart.quantity).label("in_stock"),
+            func.sum(Product.price * Cart.quantity).over().label("cart_total"),
+        ).join(Product, Product.id == Cart.product_id).where(
+            Cart.user_id == user_id
+        ).order_by(Cart.created_at, Cart.id)
+
+    @staticmethod
+    def _cart_details(rows) -> dict:
+        items = [
+            {
+                "id": row.id,
+                "product_id": row.product_id,
+                "quantity": row.quantity,
+                "line_total": row.line_total,
+                "in_stock": row.in_stock,
+                "product": {
+                    "id": row.product_id,
+                    "name": row.name,
+                    "price": row.price,
+                    "image_url": row.image_url,
+                    "stock_quantity": row.stock_quantity,
+                },
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+            }
+            for row in rows
+        ]
+        return {
+            "items": items,
+            "total": rows[0].cart_total if rows else 0,
+            "item_count": sum(row.quantity for row in rows),
+        }
+
     def add_to_cart(self, cart_data: CartCreate, user_id: Optional[int] = None) -> Cart:
-        # Check if product exists and has sufficient stock
-        product = self.db.query(Product).filter(Product.id == cart_data.product_id).first()
+        cart_item = self._upsert_line(user_id, cart_data.product_id, cart_data.quantity, increment=True)
+        if cart_item is None:
+            self.db.rollback()
+            raise self._stock_failure(cart_data.product_id, cart_data.quantity)
+
+        # RETURNING loaded every column; detach so the commit does not expire it
+        self.db.expunge(cart_item)
+        self.db.commit()
+        return cart_item
+
+    def apply_batch(self, operations: List[CartOperation], user_id: int) -> None:
+        """
+        Apply add, update and remove operations (keyed by product) in one
+        transaction. Any failing operation rolls the whole batch back.
+        """
+        try:
+            for index, operation in enumerate(operations):
+                if operation.op == "remove":
+                    self.db.query(Cart).filter(
+                        Cart.user_id == user_id,
+                        Cart.product_id == operation.product_id
+                    ).delete(synchronize_session=False)
+                    continue
+
+                cart_item = self._upsert_line(
+                    user_id, operation.product_id, operation.quantity,
+                    increment=operation.op == "add"
+                )
+                if cart_item is None:
+                    self.db.rollback()
+                    failure = self._stock_failure(operation.product_id, operation.quantity)
+                    failure.detail = f"Operation {index} ({operation.op} product {operation.product_id}): {failure.detail}"
+                    raise failure
+
+            self.db.commit()
+        except HTTPException:
+            raise
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def _upsert_line(self, user_id: Optional[int], product_id: int, quantity: int, increment: bool) -> Optional[Cart]:
+        """
+        Insert a cart line, or add to / overwrite the existing one, in one
+        statement. The stock check runs in the same statement so concurrent
+        double-clicks cannot overshoot stock. Returns None if the product
+        does not exist or lacks stock. Does not commit.
+        """
+        new_quantity = "cart.quantity + EXCLUDED.quantity" if increment else "EXCLUDED.quantity"
+        return self.db.execute(
+            select(Cart).from_statement(text(f"""
+                INSERT INTO cart (user_id, product_id, quantity)
+                SELECT :user_id, products.id, :quantity
+                FROM products
+                WHERE products.id = :product_id AND products.stock_quantity >= :quantity
+                ON CONFLICT (user_id, product_id) DO UPDATE
+                SET quantity = {new_quantity}, updated_at = now()
+                WHERE {new_quantity} <= (
+                    SELECT stock_quantity FROM products WHERE products.id = EXCLUDED.product_id
+                )
+                RETURNING cart.*
+            """)),
+            {"user_id": user_id, "product_id": product_id, "quantity": quantity}
+        ).scalar_one_or_none()
+
+    def _stock_failure(self, product_id: int, quantity: int) -> HTTPException:
+        # Only the failure path pays for working out why an upsert matched nothing
+        product = self.db.query(Product).filter(Product.id == product_id).first()
         if not product:
-            raise HTTPException(
+            return HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Product not found"
             )
-
-        if product.stock_quantity < cart_data.quantity:
-            raise HTTPException(
+        if product.stock_quantity < quantity:
+            return HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Insufficient stock"
             )
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient stock for requested quantity"
+        )
 
-        # Check if item already exists in cart
-        existing_item = self.db.query(Cart).filter(
-            Cart.product_id == cart_data.product_id,
-            Cart.user_id == user_id
-        ).first()
-
-        if existing_item:
-            # Update quantity
-            new_quantity = existing_item.quantity + cart_data.quantity
-            if product.stock_quantity < new_quantity:
+    def update_cart_item(self, cart_item_id: int, cart_data: CartUpdate, user_id: Optional[int] = None) -> Cart:
+        # Ownership and stock are checked by the UPDATE itself
+        cart_item = self.db.execute(
+            select(Cart).from_statement(text("""
+                UPDATE cart
+                SET quantity = :quantity, updated_at = now()
+                FROM products
+                WHERE cart.id = :cart_item_id
+                  AND (CAST(:user_id AS INTEGER) IS NULL OR cart.user_id = :user_id)
+                  AND products.id = cart.product_id
+                  AND products.stock_quantity >= :quantity
+                RETURNING cart.*
+            """)),
+            {"cart_item_id": cart_item_id, "user_id": user_id, "quantity": cart_data.quantity}
+        ).scalar_one_or_none()
+
+        if cart_item is None:
+            self.db.rollback()
+            existing_item = self.db.query(Cart).filter(Cart.id == cart_item_id).first()
+            if not existing_item:
                 raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Insufficient stock for requested quantity"
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Cart item not found"
+                )
+            if user_id and existing_item.user_id != user_id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Not authorized to update this cart item"
                 )
-            existing_item.quantity = new_quantity
-            self.db.commit()
-            self.db.refresh(existing_item)
-            return existing_item
-        else:
-            # Create new cart item
-            cart_item = Cart(
-                user_id=user_id,
-                product_id=cart_data.product_id,
-                quantity=cart_data.quantity
-            )
-            self.db.add(cart_item)
-            self.db.commit()
-            self.db.refresh(cart_item)
-            return cart_item
-
-    def update_cart_item(self, cart_item_id: int, cart_data: CartUpdate, user_id: Optional[int] = None) -> Cart:
-        cart_item = self.db.query(Cart).filter(Cart.id == cart_item_id).first()
-        if not cart_item:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Cart item not found"
-            )
-
-        # Check if user owns this cart item
-        if user_id and cart_item.user_id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to update this cart item"
-            )
-
-        # Check stock availability
-        product = self.db.query(Product).filter(Product.id == cart_item.product_id).first()
-        if product.stock_quantity < cart_data.quantity:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Insufficient stock"
             )
 
-        cart_item.quantity = cart_data.quantity
+        self.db.expunge(cart_item)
         self.db.commit()
-        self.db.refresh(cart_item)
         return cart_item
 
     def remove_from_cart(self, cart_item_id: int, user_id: Optional[int] = None) -> bool:
@@ -109,14 +223,10 @@ class CartService:
         self.db.commit()
         return True
 
-    def clear_cart(self, user_id: Optional[int] = None) -> bool:
-        query = self.db.query(Cart)
-        if user_id:
-            query = query.filter(Cart.user_id == user_id)
-        
-        cart_items = query.all()
-        for item in cart_items:
-            self.db.delete(item)
-        
+    def clear_cart(self, user_id: Optional[int] = None) -> int:
+        """Delete the user's cart lines in one statement; returns rows removed."""
+        deleted = self.db.query(Cart).filter(
+            Cart.user_id == user_id
+        ).delete(synchronize_session=False)
         self.db.commit()
-        return True
+        return deleted
@@ -1,5 +1,9 @@
+from sqlalchemy import Integer, any_, bindparam, func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
+from datetime import datetime
 from fastapi import HTTPException, status
 from decimal import Decimal
 
@@ -7,10 +11,25 @@ from app.models.order import Order
 from app.models.product import Product
 from app.models.cart import Cart
 from app.schemas.order import OrderCreate
+from app.utils.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.services.product_service import invalidate_products
+from app.core.invalidation import publish, STOCK_CHANNEL
+
+# Target status -> statuses an order may move from
+ORDER_TRANSITIONS = {
+    "paid": ("pending", "failed"),
+    "failed": ("pending",),
+    "processing": ("paid",),
+    "shipped": ("paid", "processing"),
+    "delivered": ("shipped",),
+    "completed": ("delivered",),
+    "cancelled": ("pending", "failed", "paid", "processing"),
+}
 
 
 class OrderService:
-    def __init__(self, db: Session):
+    # The *_async read methods need an AsyncSession; everything else a Session
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
 
     def get_order_by_id(self, order_id: int) -> Optional[Order]:
@@ -19,73 +38,121 @@ class OrderService:
     def get_user_orders(self, user_id: int) -> List[Order]:
         return self.db.query(Order).filter(Order.user_id == user_id).all()
 
-    def get_all_orders(self) -> List[Order]:
-        return self.db.query(Order).all()
+    def get_user_orders_version(self, user_id: int) -> Tuple[Optional[datetime], int]:
+        """Latest updated_at and row count of a user's orders, for ETag checks."""
+        latest, count = self.db.query(
+            func.max(Order.updated_at), func.count(Order.id)
+        ).filter(Order.user_id == user_id).one()
+        return latest, count
+
+    async def get_user_orders_async(self, user_id: int) -> List[Order]:
+        return list(await self.db.scalars(select(Order).where(Order.user_id == user_id)))
+
+    async def get_user_orders_version_async(self, user_id: int) -> Tuple[Optional[datetime], int]:
+        """get_user_orders_version() on an AsyncSession."""
+        latest, count = (await self.db.execute(
+            select(func.max(Order.updated_at), func.count(Order.id)).where(Order.user_id == user_id)
+        )).one()
+        return latest, count
+
+    def get_all_orders(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Order], Optional[str]]:
+        return paginate(self.db.query(Order), Order, limit, cursor)
 
     def create_order(self, order_data: OrderCreate, user_id: int) -> List[Order]:
-        created_orders = []
-        
+        """
+        Create one Order row per checkout item in a single transaction.
+
+        Round trips stay constant regardless of basket size: one locking
+        SELECT for every product, one bulk INSERT ... RETURNING for the
+        orders and one statement to adjust the cart.
+        """
+        # Total requested per product, so repeated lines are checked together
+        requested = {}
+        for item in order_data.items:
+            requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
+
         try:
-            # Loop through every item in order_data.items in a single transaction
-            for item in order_data.items:
-                # Validate each product exists and has sufficient stock
-                product = self.db.query(Product).filter(Product.id == item.product_id).first()
+            # Lock in id order so concurrent checkouts cannot deadlock each other
+            products = self.db.query(Product).filter(
+                Product.id.in_(requested.keys())
+            ).order_by(Product.id).with_for_update().all()
+            products_by_id = {product.id: product for product in products}
+
+            for product_id, quantity in requested.items():
+                product = products_by_id.get(product_id)
                 if not product:
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Product with ID {item.product_id} not found"
+                        detail=f"Product with ID {product_id} not found"
                     )
 
-                if product.stock_quantity < item.quantity:
+                if product.stock_quantity < quantity:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Insufficient stock for product {item.product_id}. Available: {product.stock_quantity}, Requested: {item.quantity}"
+                        detail=f"Insufficient stock for product {product_id}. Available: {product.stock_quantity}, Requested: {quantity}"
                     )
 
-                # Calculate price from the DB (product.price * item.quantity) — never trust the client price
-                unit_price = product.price
-                total_amount = unit_price * item.quantity
-
-                # Create one Order row per item, all sharing the same shipping_address
-                order = Order(
-                    product_id=item.product_id,
-                    user_id=user_id,
-                    amount=total_amount,
-                    quantity=item.quantity,
-                    unit_price=unit_price,
-                    order_status="pending",
-                    shipping_address=order_data.shipping_address
-                )
-
-                self.db.add(order)
-                self.db.flush()  # Get the order ID without committing
-
-                # Remove each item from the user's cart if it exists
-                cart_item = self.db.query(Cart).filter(
-                    Cart.product_id == item.product_id,
-                    Cart.user_id == user_id
-                ).first()
-                if cart_item:
-                    if cart_item.quantity <= item.quantity:
-                        self.db.delete(cart_item)
-                    else:
-                        cart_item.quantity -= item.quantity
+            # Calculate price from the DB (product.price * item.quantity) — never trust the client price
+            rows = [
+                {
+                    "product_id": item.product_id,
+                    "user_id": user_id,
+                    "amount": products_by_id[item.product_id].price * item.quantity,
+                    "quantity": item.quantity,
+                    "unit_price": products_by_id[item.product_id].price,
+                    "order_status": "pending",
+                    "shipping_address": order_data.shipping_address
+                }
+                for item in order_data.items
+            ]
+            created_orders = list(self.db.scalars(
+                insert(Order).returning(Order, sort_by_parameter_order=True),
+                rows
+            ))
 
-                created_orders.append(order)
+            self._remove_ordered_from_cart(user_id, requested)
 
-            # Commit once at the end of the loop
-            self.db.commit()
-            
-            # Refresh all orders to get the final state
+            # RETURNING already loaded every column; detach the orders so the
+            # commit does not expire them and force one refresh per row
             for order in created_orders:
-                self.db.refresh(order)
-                
+                self.db.expunge(order)
+            self.db.commit()
+
             return created_orders
-            
+
         except Exception as e:
             self.db.rollback()
             raise e
 
+    def _remove_ordered_from_cart(self, user_id: int, quantities: dict) -> None:
+        """
+        Subtract ordered quantities from the user's cart in one statement:
+        rows that would drop to zero are deleted, the rest are decremented.
+        """
+        params = {"user_id": user_id}
+        value_rows = []
+        for index, (product_id, quantity) in enumerate(quantities.items()):
+            value_rows.append(f"(CAST(:product_id_{index} AS INTEGER), CAST(:quantity_{index} AS INTEGER))")
+            params[f"product_id_{index}"] = product_id
+            params[f"quantity_{index}"] = quantity
+
+        self.db.execute(text(f"""
+            WITH ordered (product_id, quantity) AS (VALUES {", ".join(value_rows)}),
+            removed AS (
+                DELETE FROM cart
+                USING ordered
+                WHERE cart.user_id = :user_id
+                  AND cart.product_id = ordered.product_id
+                  AND cart.quantity <= ordered.quantity
+            )
+            UPDATE cart
+            SET quantity = cart.quantity - ordered.quantity, updated_at = now()
+            FROM ordered
+            WHERE cart.user_id = :user_id
+              AND cart.product_id = ordered.product_id
+              AND cart.quantity > ordered.quantity
+        """), params)
+
     def update_order_status(self, order_id: int, new_status: str) -> Order:
         order = self.get_order_by_id(order_id)
         if not order:
@@ -99,20 +166,112 @@ class OrderService:
         self.db.refresh(order)
         return order
 
-    def deduct_stock(self, order_ids: list) -> None:
+    def transition_orders(self, order_ids: List[int], new_status: str,
+                          from_statuses: Optional[List[str]] = None, commit: bool = True) -> List[int]:
         """
-        Deducts stock for all orders in a single database operation.
-        More efficient than looping individual queries.
+        Move orders to new_status in one UPDATE ... RETURNING.
+
+        Only orders currently in one of from_statuses (by default the allowed
+        sources in ORDER_TRANSITIONS) are changed; the rest are left alone, so
+        replays and concurrent transitions are harmless.
+
+        Returns:
+            list: IDs of the orders that were actually transitioned
         """
-        orders = self.db.query(Order).filter(Order.id.in_(order_ids)).all()
-        
-        for order in orders:
-            self.db.query(Product).filter(
-                Product.id == order.product_id
-            ).update({
-                Product.stock_quantity: Product.stock_quantity - order.quantity
-            })
-        
-        self.db.commit()
+        allowed = ORDER_TRANSITIONS.get(new_status)
+        if allowed is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown order status '{new_status}'. Allowed: {', '.join(ORDER_TRANSITIONS)}"
+            )
+        if from_statuses is not None:
+            invalid = set(from_statuses) - set(allowed)
+            if invalid:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Orders cannot move from {', '.join(sorted(invalid))} to '{new_status}'"
+                )
+            allowed = from_statuses
+        if not order_ids:
+            return []
+
+        statement = update(Order).where(
+            Order.id == any_(bindparam("order_ids", list(order_ids), type_=ARRAY(Integer))),
+            Order.order_status.in_(allowed)
+        ).values(order_status=new_status).returning(Order.id)
+
+        transitioned = list(self.db.scalars(statement, execution_options={"synchronize_session": False}))
+        if commit:
+            self.db.commit()
+        return transitioned
 
+    def deduct_stock(self, order_ids: list, commit: bool = True) -> dict:
+        """
+        Deducts stock for all orders in a single statement.
+
+        Each order is deducted at most once: orders are claimed with
+        FOR UPDATE and stamped with stock_deducted_at, so a replayed webhook
+        is a no-op. A product is only decremented if it still has enough
+        stock for every claimed order line on it; otherwise those lines are
+        reported as failed and left unstamped.
+
+        With commit=False the caller owns the transaction and must call
+        invalidate_products(result["product_ids"]) after committing it.
+
+        Returns:
+            dict: deducted order IDs, failed lines, skipped (already
+            deducted or unknown) order IDs and the product IDs touched
+        """
+        if not order_ids:
+            return {"deducted": [], "failed": [], "skipped": [], "product_ids": []}
+
+        rows = self.db.execute(text("""
+            WITH lines AS (
+                SELECT id AS order_id, product_id, quantity
+                FROM orders
+                WHERE id = ANY(:order_ids) AND stock_deducted_at IS NULL
+                FOR UPDATE
+            ),
+            totals AS (
+                SELECT product_id, SUM(quantity) AS quantity
+                FROM lines
+                GROUP BY product_id
+            ),
+            deducted AS (
+                UPDATE products
+                SET stock_quantity = products.stock_quantity - totals.quantity, updated_at = now()
+                FROM totals
+                WHERE products.id = totals.product_id
+                  AND products.stock_quantity >= totals.quantity
+                RETURNING products.id
+            ),
+            stamped AS (
+                UPDATE orders
+                SET stock_deducted_at = now()
+                FROM lines
+                WHERE orders.id = lines.order_id
+                  AND lines.product_id IN (SELECT id FROM deducted)
+                RETURNING orders.id
+            )
+            SELECT lines.order_id, lines.product_id, lines.quantity, stamped.id IS NOT NULL AS deducted
+            FROM lines
+            LEFT JOIN stamped ON stamped.id = lines.order_id
+        """), {"order_ids": list(order_ids)}).all()
+
+        deducted = [row.order_id for row in rows if row.deducted]
+        failed = [
+            {"order_id": row.order_id, "product_id": row.product_id, "quantity": row.quantity}
+            for row in rows if not row.deducted
+        ]
+        seen = {row.order_id for row in rows}
+        skipped = [order_id for order_id in order_ids if order_id not in seen]
+
+        product_ids = sorted({row.product_id for row in rows if row.deducted})
+        if product_ids:
+            publish(self.db, STOCK_CHANNEL, product_ids=product_ids)
+        if commit:
+            self.db.commit()
+            if product_ids:
+                invalidate_products(product_ids)
 
+        return {"deducted": deducted, "failed": failed, "skipped": skipped, "product_ids": product_ids}
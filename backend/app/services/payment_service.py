@@ -1,9 +1,14 @@
-import requests
+import os
 import logging
+from typing import Optional
+
+import httpx
+
 from app.config import settings
+from app.core.metrics import observe_external
 
-# All Paystack API calls go to this base URL
-PAYSTACK_BASE_URL = "https://api.paystack.co"
+# All Paystack API calls go to this base URL (overridable to point at a fake server)
+PAYSTACK_BASE_URL = settings.paystack_base_url
 
 # Logger for this module so errors are traceable in your logs
 logger = logging.getLogger(__name__)
@@ -15,6 +20,110 @@ HEADERS = {
     "Content-Type": "application/json",
 }
 
+# One pooled client of each kind per worker process, so repeat calls reuse
+# an open TLS connection instead of handshaking with Paystack every time.
+# Sync routes run in the threadpool and share _client; async routes must use
+# the *_async functions so they never block the event loop.
+_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_client_pid: Optional[int] = None
+
+
+def _client_options() -> dict:
+    return {
+        "base_url": PAYSTACK_BASE_URL,
+        "headers": HEADERS,
+        "http2": settings.paystack_http2,
+        "timeout": httpx.Timeout(
+            settings.paystack_timeout_seconds,
+            connect=settings.paystack_connect_timeout_seconds,
+        ),
+        "limits": httpx.Limits(
+            max_connections=settings.paystack_max_connections,
+            max_keepalive_connections=settings.paystack_max_keepalive_connections,
+            keepalive_expiry=settings.paystack_keepalive_expiry_seconds,
+        ),
+    }
+
+
+def _check_pid() -> None:
+    # Connections opened before a gunicorn fork must not be shared with the parent
+    global _client, _async_client, _client_pid
+    if _client_pid != os.getpid():
+        _client = None
+        _async_client = None
+        _client_pid = os.getpid()
+
+
+def get_client() -> httpx.Client:
+    global _client
+    _check_pid()
+    if _client is None:
+        _client = httpx.Client(**_client_options())
+    return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    _check_pid()
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(**_client_options())
+    return _async_client
+
+
+async def close_clients() -> None:
+    """Close pooled connections on worker shutdown."""
+    global _client, _async_client
+    if _client is not None:
+        _client.close()
+        _client = None
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def _initialize_payload(email: str, amount_naira: float, order_ids: list) -> dict:
+    amount_kobo = int(amount_naira * 100)
+
+    return {
+        "email": email,
+        "amount": amount_kobo,
+        "metadata": {
+            # order_ids is a list — the webhook handler must iterate
+            # over all IDs to update each order status on payment confirmation
+            "order_ids": order_ids,
+        },
+        "callback_url": settings.payment_callback_url
+    }
+
+
+def _initialize_result(response: httpx.Response) -> dict:
+    response.raise_for_status()
+    data = response.json()
+
+    return {
+        "status": data.get("status", False),
+        "authorization_url": data["data"]["authorization_url"],
+        "reference": data["data"]["reference"],
+        "message": data.get("message", ""),
+    }
+
+
+def _verify_result(response: httpx.Response) -> dict:
+    response.raise_for_status()
+    data = response.json()
+
+    transaction = data.get("data", {})
+    payment_status = transaction.get("status", "")
+
+    return {
+        "status": data.get("status", False),
+        "paid": payment_status == "success",
+        "amount": transaction.get("amount", 0) / 100,  # convert kobo back to Naira
+        "email": transaction.get("customer", {}).get("email", ""),
+        "message": data.get("message", ""),
+    }
+
 
 def initialize_payment(email: str, amount_naira: float, order_ids: list) -> dict:
     """
@@ -34,41 +143,36 @@ def initialize_payment(email: str, amount_naira: float, order_ids: list) -> dict
         reference         -- unique reference string for this payment
         message           -- description from Paystack
     """
-    amount_kobo = int(amount_naira * 100)
+    payload = _initialize_payload(email, amount_naira, order_ids)
 
-    payload = {
-        "email": email,
-        "amount": amount_kobo,
-        "metadata": {
-            # order_ids is a list — the webhook handler must iterate
-            # over all IDs to update each order status on payment confirmation
-            "order_ids": order_ids,
-        },
-        "callback_url": settings.payment_callback_url
-    }
+    try:
+        with observe_external("paystack", "initialize"):
+            response = get_client().post("/transaction/initialize", json=payload)
+        return _initialize_result(response)
+
+    except httpx.TimeoutException:
+        logger.error("Paystack initialize: request timed out")
+        return {"status": False, "message": "Payment provider timed out. Please try again."}
+
+    except httpx.HTTPError as e:
+        logger.error(f"Paystack initialize error: {e}")
+        return {"status": False, "message": "Could not connect to payment provider."}
+
+
+async def initialize_payment_async(email: str, amount_naira: float, order_ids: list) -> dict:
+    """Non-blocking initialize_payment for async routes. Same arguments and result."""
+    payload = _initialize_payload(email, amount_naira, order_ids)
 
     try:
-        response = requests.post(
-            f"{PAYSTACK_BASE_URL}/transaction/initialize",
-            json=payload,
-            headers=HEADERS,
-            timeout=10,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        return {
-            "status": data.get("status", False),
-            "authorization_url": data["data"]["authorization_url"],
-            "reference": data["data"]["reference"],
-            "message": data.get("message", ""),
-        }
-
-    except requests.exceptions.Timeout:
+        with observe_external("paystack", "initialize"):
+            response = await get_async_client().post("/transaction/initialize", json=payload)
+        return _initialize_result(response)
+
+    except httpx.TimeoutException:
         logger.error("Paystack initialize: request timed out")
         return {"status": False, "message": "Payment provider timed out. Please try again."}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Paystack initialize error: {e}")
         return {"status": False, "message": "Could not connect to payment provider."}
 
@@ -91,29 +195,30 @@ def verify_payment(reference: str) -> dict:
         message -- description from Paystack
     """
     try:
-        response = requests.get(
-            f"{PAYSTACK_BASE_URL}/transaction/verify/{reference}",
-            headers=HEADERS,
-            timeout=10,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        transaction = data.get("data", {})
-        payment_status = transaction.get("status", "")
-
-        return {
-            "status": data.get("status", False),
-            "paid": payment_status == "success",
-            "amount": transaction.get("amount", 0) / 100,  # convert kobo back to Naira
-            "email": transaction.get("customer", {}).get("email", ""),
-            "message": data.get("message", ""),
-        }
-
-    except requests.exceptions.Timeout:
+        with observe_external("paystack", "verify"):
+            response = get_client().get(f"/transaction/verify/{reference}")
+        return _verify_result(response)
+
+    except httpx.TimeoutException:
+        logger.error(f"Paystack verify: timed out for reference {reference}")
+        return {"status": False, "paid": False, "message": "Verification timed out."}
+
+    except httpx.HTTPError as e:
+        logger.error(f"Paystack verify error: {e}")
+        return {"status": False, "paid": False, "message": "Verification failed."}
+
+
+async def verify_payment_async(reference: str) -> dict:
+    """Non-blocking verify_payment for async routes. Same arguments and result."""
+    try:
+        with observe_external("paystack", "verify"):
+            response = await get_async_client().get(f"/transaction/verify/{reference}")
+        return _verify_result(response)
+
+    except httpx.TimeoutException:
         logger.error(f"Paystack verify: timed out for reference {reference}")
         return {"status": False, "paid": False, "message": "Verification timed out."}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Paystack verify error: {e}")
-        return {"status": False, "paid": False, "message": "Verification failed."}
\ No newline at end of file
+        return {"status": False, "paid": False, "message": "Verification failed."}
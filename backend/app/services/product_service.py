@@ -1,14 +1,42 @@
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 from fastapi import HTTPException, status
 
 from app.models.product import Product
-from app.schemas.product import ProductCreate, ProductUpdate
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.core.invalidation import publish, subscribe, subscribe_reset, CATALOG_CHANNEL, STOCK_CHANNEL
+from app.utils.cache import TTLCache
 from app.utils.cloudinary import upload_image, update_image, delete_image
+from app.utils.pagination import paginate, paginate_ranked, paginate_async, paginate_ranked_async, DEFAULT_PAGE_SIZE
+from app.config import settings
+
+# Per-process catalog cache. Keys are ("product", id) for single products and
+# ("listing", limit, cursor) for listing pages; values are ProductResponse snapshots.
+product_cache = TTLCache(maxsize=settings.product_cache_size, ttl=settings.product_cache_ttl_seconds)
+
+
+def invalidate_products(product_ids: Optional[List[int]] = None) -> None:
+    """
+    Evict cached products after a catalog or stock write.
+
+    Listing pages are always evicted, since any product change can alter them.
+    """
+    if product_ids:
+        product_cache.delete(*[("product", product_id) for product_id in product_ids])
+    product_cache.delete_prefix("listing")
+
+
+# Evict on writes made by other workers
+subscribe(CATALOG_CHANNEL, lambda payload: invalidate_products(payload.get("product_ids")))
+subscribe(STOCK_CHANNEL, lambda payload: invalidate_products(payload.get("product_ids")))
+subscribe_reset(product_cache.clear)
 
 
 class ProductService:
-    def __init__(self, db: Session):
+    # The *_async read methods need an AsyncSession; everything else a Session
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
 
     def get_product_by_id(self, product_id: int) -> Optional[Product]:
@@ -21,8 +49,79 @@ class ProductService:
                 )
         return product
 
-    def get_all_products(self) -> List[Product]:
-        return self.db.query(Product).filter(Product.is_deleted == False).all()
+    async def get_product_by_id_async(self, product_id: int) -> Optional[Product]:
+        product = await self.db.scalar(select(Product).where(Product.id == product_id))
+        if product:
+            if product.is_deleted:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Product not available"
+                )
+        return product
+
+    def get_cached_product(self, product_id: int) -> Optional[ProductResponse]:
+        """
+        Cached read for public routes. Returns a ProductResponse snapshot
+        rather than an ORM instance, so it must not be used for writes.
+        """
+        key = ("product", product_id)
+        cached = product_cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = product_cache.generation
+        product = self.get_product_by_id(product_id)
+        if not product:
+            return None
+
+        snapshot = ProductResponse.model_validate(product)
+        product_cache.set(key, snapshot, generation)
+        return snapshot
+
+    async def get_cached_product_async(self, product_id: int) -> Optional[ProductResponse]:
+        """get_cached_product() on an AsyncSession."""
+        key = ("product", product_id)
+        cached = product_cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = product_cache.generation
+        product = await self.get_product_by_id_async(product_id)
+        if not product:
+            return None
+
+        snapshot = ProductResponse.model_validate(product)
+        product_cache.set(key, snapshot, generation)
+        return snapshot
+
+    def get_all_products(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[ProductResponse], Optional[str]]:
+        key = ("listing", limit, cursor)
+        cached = product_cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = product_cache.generation
+        query = self.db.query(Product).filter(Product.is_deleted == False)
+        products, next_cursor = paginate(query, Product, limit, cursor)
+
+        page = ([ProductResponse.model_validate(product) for product in products], next_cursor)
+        product_cache.set(key, page, generation)
+        return page
+
+    async def get_all_products_async(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[ProductResponse], Optional[str]]:
+        """get_all_products() on an AsyncSession, sharing the same cache."""
+        key = ("listing", limit, cursor)
+        cached = product_cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = product_cache.generation
+        statement = select(Product).where(Product.is_deleted == False)
+        products, next_cursor = await paginate_async(self.db, statement, Product, limit, cursor)
+
+        page = ([ProductResponse.model_validate(product) for product in products], next_cursor)
+        product_cache.set(key, page, generation)
+        return page
 
     def get_product_by_name(self, product_name: str) -> Optional[Product]:
         product = self.db.query(Product).filter(Product.name == product_name).first()
@@ -34,12 +133,52 @@ class ProductService:
                 )
         return product
 
+    async def get_product_by_name_async(self, product_name: str) -> Optional[Product]:
+        product = await self.db.scalar(select(Product).where(Product.name == product_name))
+        if product:
+            if product.is_deleted:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Product not available"
+                )
+        return product
+
+    @staticmethod
+    def _search_clauses(search_term: str):
+        """
+        Full-text search over name and description, with trigram matching on
+        name so misspelled queries still find products.
+
+        Results are ordered by full-text rank plus name similarity.
+        """
+        ts_query = func.websearch_to_tsquery("english", search_term)
+        score = func.ts_rank_cd(Product.search_vector, ts_query) + func.similarity(Product.name, search_term)
+        criteria = (
+            Product.is_deleted == False,
+            or_(
+                Product.search_vector.op("@@")(ts_query),
+                Product.name.op("%")(search_term)
+            )
+        )
+        return criteria, (score.desc(), Product.id.desc())
+
+    def search_products(self, search_term: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Product], Optional[str]]:
+        criteria, ordering = self._search_clauses(search_term)
+        query = self.db.query(Product).filter(*criteria).order_by(*ordering)
+        return paginate_ranked(query, limit, cursor)
+
+    async def search_products_async(self, search_term: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Product], Optional[str]]:
+        criteria, ordering = self._search_clauses(search_term)
+        statement = select(Product).where(*criteria).order_by(*ordering)
+        return await paginate_ranked_async(self.db, statement, limit, cursor)
+
     def create_product(self, product_data) -> Product:
         """
         Create a new product with optional image upload.
         
         Args:
-            product_data: Product data object with image_file attribute
+            product_data: Product data object with image_file attribute, or
+                image_url for an image the client uploaded to Cloudinary itself
             
         Returns:
             Product: Created product object
@@ -49,7 +188,7 @@ class ProductService:
             HTTPException: If product creation fails
         """
         # Handle image upload if provided
-        image_url = None
+        image_url = getattr(product_data, 'image_url', None)
         old_image_url = None  # For cleanup in case of error
         
         try:
@@ -68,8 +207,10 @@ class ProductService:
             )
 
             self.db.add(product)
+            publish(self.db, CATALOG_CHANNEL)
             self.db.commit()
             self.db.refresh(product)
+            invalidate_products()
             
             return product
             
@@ -90,7 +231,7 @@ class ProductService:
                 detail=f"Failed to create product: {str(e)}"
             )
 
-    def update_product(self, product_id: int, product_data, image_file=None) -> Product:
+    def update_product(self, product_id: int, product_data, image_file=None, image_url: Optional[str] = None) -> Product:
         """
         Update an existing product with optional image replacement.
         
@@ -98,6 +239,7 @@ class ProductService:
             product_id: ID of product to update
             product_data: Product data object with updated fields
             image_file: Optional new image file
+            image_url: Optional URL of a new image the client uploaded to Cloudinary itself
             
         Returns:
             Product: Updated product object
@@ -114,7 +256,7 @@ class ProductService:
             )
 
         old_image_url = product.image_url
-        new_image_url = old_image_url  # Default to keeping old image
+        new_image_url = image_url or old_image_url  # Default to keeping old image
 
         try:
             # Handle image update if provided
@@ -132,8 +274,10 @@ class ProductService:
             if new_image_url != old_image_url:
                 product.image_url = new_image_url
 
+            publish(self.db, CATALOG_CHANNEL, product_ids=[product_id])
             self.db.commit()
             self.db.refresh(product)
+            invalidate_products([product_id])
             
             # Delete old image from Cloudinary if it was replaced
             if old_image_url and new_image_url != old_image_url:
@@ -187,7 +331,9 @@ class ProductService:
         try:
             # Update product as deleted in database
             self.db.query(Product).filter(Product.id == product_id).update({"is_deleted": True})
+            publish(self.db, CATALOG_CHANNEL, product_ids=[product_id])
             self.db.commit()
+            invalidate_products([product_id])
             
             # Delete image from Cloudinary if it exists
             # if image_url_to_delete:
@@ -223,6 +369,8 @@ class ProductService:
             )
 
         product.stock_quantity = new_quantity
+        publish(self.db, STOCK_CHANNEL, product_ids=[product_id])
         self.db.commit()
         self.db.refresh(product)
+        invalidate_products([product_id])
         return product
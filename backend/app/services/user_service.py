@@ -1,9 +1,12 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 from decimal import Decimal
 
 from app.models.user import User, Account, UserStatus
+from app.utils.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.core.invalidation import publish, USER_STATUS_CHANNEL
+from app.core.auth import invalidate_principals
 
 
 class UserService:
@@ -16,8 +19,8 @@ class UserService:
     def get_user_account(self, user_id: int) -> Optional[Account]:
         return self.db.query(Account).filter(Account.user_id == user_id).first()
 
-    def get_all_users(self) -> List[User]:
-        return self.db.query(User).all()
+    def get_all_users(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[User], Optional[str]]:
+        return paginate(self.db.query(User), User, limit, cursor)
 
     def update_account_balance(self, user_id: int, new_balance: Decimal) -> Account:
         account = self.db.query(Account).filter(Account.user_id == user_id).first()
@@ -101,7 +104,9 @@ class UserService:
         else:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid action '{action}'. Use: suspend, reactivate, delete")
 
+        publish(self.db, USER_STATUS_CHANNEL, user_ids=[user.id])
         self.db.commit()
+        invalidate_principals([user.id])
         self.db.refresh(user)
         return {
             "message": f"User '{user.username}' (ID: {user.id}) {action}d successfully",
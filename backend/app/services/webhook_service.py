@@ -0,0 +1,107 @@
+import logging
+from datetime import datetime
+from typing import List
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, Transaction
+from app.models.webhook_event import WebhookEvent
+from app.services.order_service import OrderService
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def event_key(event: dict) -> str:
+        """Stable key for a Paystack event; retries of the same event share it."""
+        data = event.get("data") or {}
+        identifier = data.get("id") or data.get("reference") or ""
+        return f"{event.get('event', '')}:{identifier}"
+
+    def record_event(self, event: dict) -> bool:
+        """
+        Insert a verified webhook into the inbox and commit.
+
+        Returns False if the event was already recorded, so Paystack
+        retries never queue the same settlement twice.
+        """
+        data = event.get("data") or {}
+        statement = insert(WebhookEvent).values(
+            event_key=self.event_key(event),
+            event_type=event.get("event", ""),
+            reference=data.get("reference"),
+            payload=event,
+            status="pending",
+            attempts=0,
+        ).on_conflict_do_nothing(index_elements=["event_key"]).returning(WebhookEvent.id)
+        inserted = self.db.execute(statement).scalar()
+        self.db.commit()
+        return inserted is not None
+
+    def apply_event(self, event: WebhookEvent) -> List[int]:
+        """
+        Apply one inbox event inside the caller's transaction without committing.
+
+        Safe to run more than once for the same event: statuses are set, not
+        toggled, and deduct_stock skips orders that were already deducted.
+
+        Returns the product IDs whose stock changed, to invalidate after commit.
+        """
+        if event.event_type != "charge.success":
+            logger.info(f"Ignoring Paystack webhook {event.event_type}")
+            return []
+        return self._settle_charge(event.payload.get("data") or {})
+
+    def _settle_charge(self, data: dict) -> List[int]:
+        reference = data.get("reference")
+        order_ids = (data.get("metadata") or {}).get("order_ids", [])
+        channel = data.get("channel", "")
+        paid_at_str = data.get("paid_at")
+        paid_at = datetime.strptime(paid_at_str, "%Y-%m-%dT%H:%M:%S.%fZ") if paid_at_str else None
+
+        if not order_ids:
+            logger.error(f"Webhook missing order_ids in metadata for reference {reference}")
+            return []
+
+        # Step 1 — Mark every transaction with this reference as successful
+        updated = self.db.query(Transaction).filter(
+            Transaction.reference == reference
+        ).update(
+            {"status": "success", "channel": channel, "paid_at": paid_at},
+            synchronize_session=False
+        )
+        if updated:
+            logger.info(f"Updated {updated} transactions to success for reference {reference}")
+        else:
+            # Fallback — only create transactions for orders that actually exist
+            logger.warning(f"No pending transaction found for reference {reference}, creating new one")
+            existing = [row.id for row in self.db.query(Order.id).filter(Order.id.in_(order_ids))]
+            self.db.add_all([
+                Transaction(
+                    order_id=order_id,
+                    reference=reference,
+                    status="success",
+                    amount=data.get("amount", 0) / 100,
+                    currency=data.get("currency", "NGN"),
+                    channel=channel,
+                    paid_at=paid_at
+                )
+                for order_id in existing
+            ])
+
+        # Step 2 — Mark the orders paid (orders already past pending are left alone)
+        order_service = OrderService(self.db)
+        order_service.transition_orders(order_ids, "paid", commit=False)
+
+        # Step 3 — Deduct stock last (replays of the same event are no-ops)
+        stock_result = order_service.deduct_stock(order_ids, commit=False)
+        if stock_result["failed"]:
+            logger.error(f"Insufficient stock when settling reference {reference}: {stock_result['failed']}")
+
+        logger.info(f"Payment confirmed for orders {order_ids}, reference {reference}")
+        return stock_result["product_ids"]
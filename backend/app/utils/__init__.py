@@ -1,3 +1,7 @@
-from .cloudinary import upload_image, update_image, delete_image
+from .cloudinary import upload_image, update_image, delete_image, sign_image_upload, uploaded_image_url
+from .pagination import paginate, encode_cursor, decode_cursor
 
-__all__ = ["upload_image", "update_image", "delete_image"]
+__all__ = [
+    "upload_image", "update_image", "delete_image", "sign_image_upload", "uploaded_image_url",
+    "paginate", "encode_cursor", "decode_cursor",
+]
@@ -1,51 +1,67 @@
 import cloudinary
 import cloudinary.uploader
+import cloudinary.utils
 from app.config import settings
+from app.core.metrics import observe_external
+from app.utils.images import ImageInfo, sniff_image
+import os
 import re
+import time
 from typing import Optional
 
 # Configure Cloudinary
 cloudinary.config(
     cloud_name=settings.cloudinary_cloud_name,
     api_key=settings.cloudinary_api_key,
-    api_secret=settings.cloudinary_api_secret
+    api_secret=settings.cloudinary_api_secret,
+    upload_prefix=settings.cloudinary_upload_prefix,
 )
 
-# Allowed file types and max size (5MB)
-ALLOWED_MIME_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/webp"}
-ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 5MB in bytes
+# Max upload size; file types are checked from content (app.utils.images)
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+ALLOWED_FORMATS = ["jpg", "jpeg", "png", "webp"]
+UPLOAD_FOLDER = "vintique/products"
+# Cloudinary rejects upload signatures older than this; upload results are
+# only accepted for the same window so an old result cannot be replayed
+SIGNED_UPLOAD_TTL_SECONDS = 60 * 60
 
 
-def validate_image_file(image_file) -> None:
+def validate_image_file(image_file) -> ImageInfo:
     """
-    Validate uploaded image file for type, size, and format.
+    Validate uploaded image file for size, type, and dimensions.
+    
+    The type comes from the file's magic bytes, not its name or the
+    client's content type, and only its headers are read.
     
     Args:
         image_file: Uploaded file object
         
+    Returns:
+        ImageInfo: Format and dimensions decoded from the header
+        
     Raises:
         ValueError: If file validation fails
     """
-    if not image_file or not hasattr(image_file, 'filename'):
+    if not image_file or not hasattr(image_file, 'file'):
         raise ValueError("No file provided")
     
-    # Check file extension
-    filename = image_file.filename.lower()
-    if not any(filename.endswith(ext) for ext in ALLOWED_EXTENSIONS):
-        raise ValueError(f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
-    
-    # Check MIME type
-    if hasattr(image_file, 'content_type') and image_file.content_type not in ALLOWED_MIME_TYPES:
-        raise ValueError(f"Invalid MIME type. Allowed types: {', '.join(ALLOWED_MIME_TYPES)}")
+    # Check file size without reading the file
+    if _file_size(image_file.file) > MAX_FILE_SIZE:
+        raise ValueError(f"File too large. Maximum size: 10MB")
     
-    # Check file size
-    if hasattr(image_file, 'size') and image_file.size > MAX_FILE_SIZE:
-        raise ValueError(f"File too large. Maximum size: 5MB")
-    
-    # Reset file pointer if it was read
-    if hasattr(image_file, 'seek'):
-        image_file.seek(0)
+    # Check the header, then rewind for the upload
+    image_file.file.seek(0)
+    info = sniff_image(image_file.file)
+    image_file.file.seek(0)
+    return info
+
+
+def _file_size(file) -> int:
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(position)
+    return size
 
 
 def upload_image(image_file) -> dict:
@@ -66,27 +82,24 @@ def upload_image(image_file) -> dict:
         # Validate file before upload
         validate_image_file(image_file)
         
-        # Read file content
-        file_content = image_file.file.read()
-        
-        # Double-check file size
-        if len(file_content) > MAX_FILE_SIZE:
-            raise ValueError(f"File too large. Maximum size: 10MB")
-        
-        # Upload to Cloudinary with validation
-        result = cloudinary.uploader.upload(
-            file_content,
-            folder="vintique/products",
-            resource_type="image",
-            allowed_formats=["jpg", "jpeg", "png", "webp"],
-            quality="auto",
-            fetch_format="auto",
-            format="auto",  # Let Cloudinary determine format
-            transformation=[
-                {"quality": "auto"},
-                {"fetch_format": "auto"}
-            ]
-        )
+        # Upload to Cloudinary with validation, streaming the spooled upload
+        # in chunks instead of reading it into memory
+        with observe_external("cloudinary", "upload"):
+            result = cloudinary.uploader.upload_large(
+                image_file.file,
+                chunk_size=settings.cloudinary_upload_chunk_bytes,
+                filename=image_file.filename,
+                folder=UPLOAD_FOLDER,
+                resource_type="image",
+                allowed_formats=ALLOWED_FORMATS,
+                quality="auto",
+                fetch_format="auto",
+                format="auto",  # Let Cloudinary determine format
+                transformation=[
+                    {"quality": "auto"},
+                    {"fetch_format": "auto"}
+                ]
+            )
         
         return result
     except ValueError as ve:
@@ -114,17 +127,12 @@ def update_image(image_file, public_id: str = None) -> dict:
         # Validate file before upload
         validate_image_file(image_file)
         
-        file_content = image_file.file.read()
-        
-        # Double-check file size
-        if len(file_content) > MAX_FILE_SIZE:
-            raise ValueError(f"File too large. Maximum size: 10MB")
-        
         upload_options = {
-            "file_content": file_content,
-            "folder": "vintique/products",
+            "chunk_size": settings.cloudinary_upload_chunk_bytes,
+            "filename": image_file.filename,
+            "folder": UPLOAD_FOLDER,
             "resource_type": "image",
-            "allowed_formats": ["jpg", "jpeg", "png", "webp"],
+            "allowed_formats": ALLOWED_FORMATS,
             "quality": "auto",
             "fetch_format": "auto",
             "format": "auto"
@@ -135,7 +143,8 @@ def update_image(image_file, public_id: str = None) -> dict:
             upload_options["public_id"] = public_id
             upload_options["overwrite"] = True
         
-        result = cloudinary.uploader.upload(**upload_options)
+        with observe_external("cloudinary", "upload"):
+            result = cloudinary.uploader.upload_large(image_file.file, **upload_options)
         return result
     except ValueError as ve:
         raise ValueError(f"Validation error: {str(ve)}")
@@ -143,6 +152,62 @@ def update_image(image_file, public_id: str = None) -> dict:
         raise Exception(f"Failed to update image: {str(e)}")
 
 
+def sign_image_upload() -> dict:
+    """
+    Sign a direct browser-to-Cloudinary upload into the products folder.
+    
+    The admin client posts the file to upload_url together with every other
+    returned field, then sends public_id, version and signature from
+    Cloudinary's response with the product instead of the file. Cloudinary
+    rejects the signature after SIGNED_UPLOAD_TTL_SECONDS.
+    
+    Returns:
+        dict: upload_url, api_key and the signed upload parameters
+    """
+    params = {
+        "timestamp": int(time.time()),
+        "folder": UPLOAD_FOLDER,
+        "allowed_formats": ",".join(ALLOWED_FORMATS),
+    }
+    return {
+        **params,
+        "signature": cloudinary.utils.api_sign_request(params, settings.cloudinary_api_secret),
+        "api_key": settings.cloudinary_api_key,
+        "upload_url": cloudinary.utils.cloudinary_api_url("upload", resource_type="image"),
+    }
+
+
+def uploaded_image_url(public_id: str, version: int, signature: str) -> str:
+    """
+    Delivery URL for an image the client uploaded with sign_image_upload().
+    
+    Checks the response signature Cloudinary computed over public_id and
+    version with our API secret, so no request to Cloudinary is needed.
+    The version is the upload time, and results older than
+    SIGNED_UPLOAD_TTL_SECONDS are refused so they cannot be replayed.
+    
+    Args:
+        public_id: public_id from Cloudinary's upload response
+        version: version from Cloudinary's upload response
+        signature: signature from Cloudinary's upload response
+        
+    Returns:
+        str: secure URL of the uploaded image
+        
+    Raises:
+        ValueError: If the signature does not match, the upload is too old or
+            the image is outside the products folder
+    """
+    if not public_id.startswith(f"{UPLOAD_FOLDER}/"):
+        raise ValueError("Image was not uploaded to the products folder")
+    if not cloudinary.utils.verify_api_response_signature(public_id, version, signature):
+        raise ValueError("Invalid image upload signature")
+    if int(version) < time.time() - SIGNED_UPLOAD_TTL_SECONDS:
+        raise ValueError("Image upload has expired, upload the image again")
+    url, _ = cloudinary.utils.cloudinary_url(public_id, resource_type="image", version=version, secure=True)
+    return url
+
+
 def delete_image(image_url: str) -> bool:
     """
     Delete an image from Cloudinary using its URL.
@@ -185,7 +250,8 @@ def delete_image(image_url: str) -> bool:
             public_id = public_id.rsplit('.', 1)[0]
         
         # Delete the image
-        result = cloudinary.uploader.destroy(public_id, resource_type="image")
+        with observe_external("cloudinary", "destroy"):
+            result = cloudinary.uploader.destroy(public_id, resource_type="image")
         
         return result.get("result") == "ok"
     except Exception as e:
@@ -0,0 +1,55 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def weak_etag(latest_update: Optional[datetime], *parts) -> str:
+    """
+    Build a weak ETag from the newest updated_at in a result set.
+
+    Extra parts (row ids, counts) are folded in so that a row leaving the set,
+    e.g. a soft delete, changes the tag even when the newest updated_at does not.
+    """
+    stamp = latest_update.timestamp() if latest_update else 0
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+    return f'W/"{stamp:.6f}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of etag against the request's If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def conditional_response(request: Request, response: Response, etag: str,
+                         cache_control: str) -> Optional[Response]:
+    """
+    Set ETag and Cache-Control on the outgoing response, and return a bare
+    304 response if the client already has this version.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def public_cache_control(max_age: int, stale_while_revalidate: int) -> str:
+    return f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+
+
+# Per-user data: browsers may keep it but must revalidate, and shared caches must not store it
+PRIVATE_REVALIDATE = "private, no-cache"
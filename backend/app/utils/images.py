@@ -0,0 +1,105 @@
+"""
+Image type and dimension sniffing from file headers.
+
+Only headers are parsed, never pixel data. JPEG metadata segments (EXIF,
+ICC profiles, XMP) are skipped with seek() rather than read, so a file is
+accepted or rejected after a few hundred bytes whatever its size.
+"""
+import os
+from dataclasses import dataclass
+from typing import BinaryIO
+
+# Enough for the PNG IHDR chunk and every WebP header variant
+HEADER_BYTES = 32
+# Reject decompression bombs before Cloudinary has to process them
+MAX_IMAGE_PIXELS = 50_000_000
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers (SOF0-SOF15 except DHT, JPG and DAC)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    format: str
+    width: int
+    height: int
+
+
+def _png_size(header: bytes) -> tuple:
+    if header[12:16] != b"IHDR" or len(header) < 24:
+        raise ValueError("Corrupt PNG header")
+    return int.from_bytes(header[16:20], "big"), int.from_bytes(header[20:24], "big")
+
+
+def _jpeg_size(file: BinaryIO) -> tuple:
+    # Walk the segments after SOI, seeking over each one until a frame header
+    while True:
+        marker = file.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise ValueError("Corrupt JPEG header")
+        code = marker[1]
+        if code == 0xFF:
+            # Fill byte before a marker
+            file.seek(-1, os.SEEK_CUR)
+            continue
+        if code == 0x01 or 0xD0 <= code <= 0xD8:
+            # Markers without a length
+            continue
+        if code in (0xD9, 0xDA):
+            raise ValueError("No JPEG frame header before the image data")
+
+        length_bytes = file.read(2)
+        length = int.from_bytes(length_bytes, "big")
+        if len(length_bytes) < 2 or length < 2:
+            raise ValueError("Corrupt JPEG header")
+        if code in JPEG_SOF_MARKERS:
+            frame = file.read(5)
+            if len(frame) < 5:
+                raise ValueError("Corrupt JPEG header")
+            return int.from_bytes(frame[3:5], "big"), int.from_bytes(frame[1:3], "big")
+        file.seek(length - 2, os.SEEK_CUR)
+
+
+def _webp_size(header: bytes) -> tuple:
+    chunk = header[12:16]
+    if chunk == b"VP8 " and header[23:26] == b"\x9d\x01\x2a":
+        # Lossy: 14-bit dimensions after the frame start code
+        return int.from_bytes(header[26:28], "little") & 0x3FFF, int.from_bytes(header[28:30], "little") & 0x3FFF
+    if chunk == b"VP8L" and header[20:21] == b"\x2f":
+        # Lossless: two 14-bit fields holding dimension - 1
+        bits = int.from_bytes(header[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(header) >= 30:
+        # Extended: two 24-bit fields holding dimension - 1
+        return int.from_bytes(header[24:27], "little") + 1, int.from_bytes(header[27:30], "little") + 1
+    raise ValueError("Corrupt WebP header")
+
+
+def sniff_image(file: BinaryIO) -> ImageInfo:
+    """
+    Identify a JPEG, PNG or WebP image from the headers of a seekable binary
+    file, starting at its current position. Leaves the position somewhere
+    inside the file; rewind before reading it again.
+
+    Raises:
+        ValueError: If the file is not one of those formats, the header is
+            corrupt, or the image is larger than MAX_IMAGE_PIXELS
+    """
+    start = file.tell()
+    header = file.read(HEADER_BYTES)
+    if header.startswith(PNG_SIGNATURE):
+        image_format, (width, height) = "png", _png_size(header)
+    elif header.startswith(b"\xff\xd8\xff"):
+        file.seek(start + 2)
+        image_format, (width, height) = "jpeg", _jpeg_size(file)
+    elif header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        image_format, (width, height) = "webp", _webp_size(header)
+    else:
+        raise ValueError("Invalid file type. Allowed types: JPEG, PNG, WebP")
+
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid {image_format.upper()} dimensions {width}x{height}")
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ValueError(f"Image too large: {width}x{height} pixels")
+    return ImageInfo(image_format, width, height)
@@ -0,0 +1,148 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+# Page size bounds shared by every paginated listing
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Deepest offset a ranked listing pages to; past it every page is a full ranked scan
+MAX_RANKED_OFFSET = MAX_PAGE_SIZE * 100
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode the (created_at, id) keyset position of a row into an opaque cursor.
+
+    Args:
+        created_at: created_at of the last row on the page
+        row_id: id of the last row on the page
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = json.dumps([created_at.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def paginate(query: Query, model: Any, limit: int = DEFAULT_PAGE_SIZE,
+             cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """
+    Apply keyset pagination on (created_at, id), newest first.
+
+    Fetches one row more than requested to know whether another page exists,
+    so no COUNT query is needed.
+
+    Args:
+        query: Filtered query over model
+        model: Mapped class with created_at and id columns
+        limit: Maximum number of rows to return
+        cursor: Cursor returned with the previous page, if any
+
+    Returns:
+        tuple: (rows, next_cursor) where next_cursor is None on the last page
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = _keyset_window(query, model, limit, cursor).all()
+    return _keyset_page(rows, limit)
+
+
+async def paginate_async(db: AsyncSession, statement: Select, model: Any, limit: int = DEFAULT_PAGE_SIZE,
+                         cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """paginate() for a select() statement on an AsyncSession."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = (await db.scalars(_keyset_window(statement, model, limit, cursor))).all()
+    return _keyset_page(rows, limit)
+
+
+def _keyset_window(query, model: Any, limit: int, cursor: Optional[str]):
+    # Query and Select share filter/order_by/limit, so both paths build the same SQL
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def _keyset_page(rows: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+
+def paginate_ranked(query: Query, limit: int = DEFAULT_PAGE_SIZE,
+                    cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """
+    Paginate an already-ordered query whose sort key is computed per request
+    (e.g. a search rank), where a (created_at, id) keyset does not apply.
+
+    The cursor carries the offset of the next page and stays opaque to clients.
+
+    Returns:
+        tuple: (rows, next_cursor) where next_cursor is None on the last page
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = _decode_offset(cursor)
+    rows = query.offset(offset).limit(limit + 1).all()
+    return _ranked_page(rows, offset, limit)
+
+
+async def paginate_ranked_async(db: AsyncSession, statement: Select, limit: int = DEFAULT_PAGE_SIZE,
+                                cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """paginate_ranked() for a select() statement on an AsyncSession."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = _decode_offset(cursor)
+    rows = (await db.scalars(statement.offset(offset).limit(limit + 1))).all()
+    return _ranked_page(rows, offset, limit)
+
+
+def _decode_offset(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["offset"])
+    except (ValueError, TypeError, KeyError):
+        offset = -1
+    if not 0 <= offset <= MAX_RANKED_OFFSET:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    return offset
+
+
+def _ranked_page(rows: List[Any], offset: int, limit: int) -> Tuple[List[Any], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if offset + limit > MAX_RANKED_OFFSET:
+            return rows, None
+        raw = json.dumps({"offset": offset + limit}).encode("utf-8")
+        next_cursor = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+    return rows, next_cursor
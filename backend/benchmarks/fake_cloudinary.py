@@ -0,0 +1,113 @@
+"""
+Local stand-in for the Cloudinary upload API, for offline benchmarking.
+
+Implements upload (including chunked uploads) and destroy for any cloud
+name and resource type with Cloudinary's response shape and an optional
+artificial latency. Uploaded bytes are counted, not stored. With an API
+secret it checks request signatures and signs responses like Cloudinary, so
+signed direct uploads can be exercised end to end. Point the app at it with
+
+    CLOUDINARY_UPLOAD_PREFIX=http://127.0.0.1:8082
+
+and run it with the app's secret
+
+    python -m benchmarks.fake_cloudinary --port 8082 --latency-ms 150 --api-secret "$CLOUDINARY_API_SECRET"
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Fake Cloudinary")
+app.state.latency = 0.0
+app.state.api_secret = ""
+app.state.assets = {}
+# Chunked uploads in progress: X-Unique-Upload-Id -> (public_id, bytes so far)
+app.state.chunked = {}
+
+# Never part of a Cloudinary request signature
+UNSIGNED_FIELDS = {"file", "api_key", "signature", "resource_type", "cloud_name"}
+
+
+def _sign(params: dict) -> str:
+    to_sign = "&".join(f"{key}={value}" for key, value in sorted(params.items()) if value)
+    return hashlib.sha1((to_sign + app.state.api_secret).encode()).hexdigest()
+
+
+@app.post("/v1_1/{cloud_name}/{resource_type}/upload")
+async def upload(cloud_name: str, resource_type: str, request: Request):
+    form = await request.form()
+    if app.state.api_secret:
+        params = {key: value for key, value in form.items() if key not in UNSIGNED_FIELDS}
+        if form.get("signature") != _sign(params):
+            return JSONResponse({"error": {"message": "Invalid Signature"}}, status_code=401)
+    upload_file = form.get("file")
+    size = len(await upload_file.read()) if hasattr(upload_file, "read") else len(upload_file or "")
+    await asyncio.sleep(app.state.latency)
+
+    folder = form.get("folder")
+    upload_id = request.headers.get("x-unique-upload-id")
+    public_id, received = app.state.chunked.get(upload_id, (form.get("public_id"), 0))
+    public_id = public_id or uuid.uuid4().hex[:20]
+    if folder and not public_id.startswith(f"{folder}/"):
+        public_id = f"{folder}/{public_id}"
+    size += received
+    content_range = request.headers.get("content-range", "")
+    if upload_id and content_range:
+        # bytes first-last/total; the upload is complete once last + 1 == total
+        last, total = content_range.split(" ")[-1].split("-")[1].split("/")
+        if int(last) + 1 < int(total):
+            app.state.chunked[upload_id] = (public_id, size)
+        else:
+            app.state.chunked.pop(upload_id, None)
+
+    version = int(time.time())
+    url = f"{request.base_url}{cloud_name}/{resource_type}/upload/v{version}/{public_id}.jpg"
+    app.state.assets[public_id] = size
+    return {
+        "asset_id": uuid.uuid4().hex,
+        "public_id": public_id,
+        "version": version,
+        "signature": _sign({"public_id": public_id, "version": version}),
+        "width": 800,
+        "height": 800,
+        "format": "jpg",
+        "resource_type": resource_type,
+        "bytes": size,
+        "type": "upload",
+        "url": url,
+        "secure_url": url,
+    }
+
+
+@app.post("/v1_1/{cloud_name}/{resource_type}/destroy")
+async def destroy(cloud_name: str, resource_type: str, request: Request):
+    form = await request.form()
+    await asyncio.sleep(app.state.latency)
+    found = app.state.assets.pop(form.get("public_id"), None) is not None
+    return {"result": "ok" if found else "not found"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument("--api-secret", default=os.getenv("CLOUDINARY_API_SECRET", ""),
+                        help="Check request signatures and sign responses with this secret")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app.state.latency = args.latency_ms / 1000
+    app.state.api_secret = args.api_secret
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
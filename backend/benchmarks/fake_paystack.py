@@ -0,0 +1,74 @@
+"""
+Local stand-in for the Paystack transaction API, for offline benchmarking.
+
+Implements the two endpoints payment_service calls with Paystack's response
+shape and an optional artificial latency. Point the app at it with
+
+    PAYSTACK_BASE_URL=http://127.0.0.1:8081
+
+and run it with
+
+    python -m benchmarks.fake_paystack --port 8081 --latency-ms 80
+"""
+import argparse
+import asyncio
+import uuid
+
+from fastapi import FastAPI, Request
+
+app = FastAPI(title="Fake Paystack")
+app.state.latency = 0.0
+app.state.transactions = {}
+
+
+@app.post("/transaction/initialize")
+async def initialize(request: Request):
+    body = await request.json()
+    await asyncio.sleep(app.state.latency)
+    reference = uuid.uuid4().hex[:16]
+    app.state.transactions[reference] = body
+    return {
+        "status": True,
+        "message": "Authorization URL created",
+        "data": {
+            "authorization_url": f"https://checkout.paystack.com/{reference}",
+            "access_code": reference,
+            "reference": reference,
+        },
+    }
+
+
+@app.get("/transaction/verify/{reference}")
+async def verify(reference: str):
+    await asyncio.sleep(app.state.latency)
+    body = app.state.transactions.get(reference, {})
+    return {
+        "status": True,
+        "message": "Verification successful",
+        "data": {
+            "reference": reference,
+            "status": "success",
+            "amount": body.get("amount", 0),
+            "currency": "NGN",
+            "channel": "card",
+            "metadata": body.get("metadata", {}),
+            "customer": {"email": body.get("email", "")},
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app.state.latency = args.latency_ms / 1000
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
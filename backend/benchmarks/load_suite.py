@@ -0,0 +1,439 @@
+"""
+Reproducible load suite for the main user journeys.
+
+Scenarios (each runs for --duration seconds at --concurrency workers):
+
+    browse    catalog pages (following cursors), product detail and search
+    cart      add a product, change its quantity, view the cart, remove it
+    checkout  check out one to three products (Paystack initialize)
+    webhooks  signed charge.success deliveries, each repeated like Paystack
+              retries, then the time for the workers to drain the inbox
+    admin     admin order, user and product listings
+
+Results go to --output as JSON: throughput and p50/p95/p99 per endpoint plus
+the commit they were measured at. Pass a previous run as --compare to print
+the change per endpoint; with --fail-on-regression the exit status is 1 when
+p95 rose or throughput fell by more than --threshold percent.
+
+Everything runs offline against the docker-compose Postgres, with the fake
+Paystack and Cloudinary servers standing in for the real APIs:
+
+    docker compose up -d db
+    cd backend && alembic upgrade head
+    python -m benchmarks.fake_paystack --port 8081 --latency-ms 80 &
+    python -m benchmarks.fake_cloudinary --port 8082 --latency-ms 150 &
+    PAYSTACK_BASE_URL=http://127.0.0.1:8081 CLOUDINARY_UPLOAD_PREFIX=http://127.0.0.1:8082 \\
+        gunicorn -c gunicorn.conf.py app.main:app &
+    python -m benchmarks.load_suite --admin-email admin@example.com --admin-password 'Secret123!' \\
+        --output benchmarks/results/$(git rev-parse --short HEAD).json
+
+The admin account must already exist. Shopper accounts and benchmark
+products are created on the first run and reused, and product stock is
+reset before every run so runs start from the same state. Random choices
+are seeded with --seed, so two runs issue the same request mix.
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+
+SCENARIOS = ("browse", "cart", "checkout", "webhooks", "admin")
+SHOPPER_PASSWORD = "BenchShopper1!"
+PRODUCT_STOCK = 10_000  # ProductUpdate allows at most 10,000
+SEARCH_TERMS = ("bench", "vintage", "lamp", "chair", "product", "zzz")
+
+# Smallest valid PNG (1x1, transparent) for benchmark product images
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d49444154789c6300010000000500010d0a2db40000000049454e44ae426082"
+)
+
+
+class Recorder:
+    """Latencies and status codes per endpoint template."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        response = None
+        try:
+            response = await client.request(method, url, **kwargs)
+            outcome = str(response.status_code)
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        self.latencies[name].append(time.perf_counter() - start)
+        self.statuses[name][outcome] += 1
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name, latencies in sorted(self.latencies.items()):
+            statuses = self.statuses[name]
+            errors = sum(count for outcome, count in statuses.items() if not outcome.isdigit() or int(outcome) >= 400)
+            endpoints[name] = {
+                "requests": len(latencies),
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "p50_ms": _percentile_ms(latencies, 0.50),
+                "p95_ms": _percentile_ms(latencies, 0.95),
+                "p99_ms": _percentile_ms(latencies, 0.99),
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+                "max_ms": round(max(latencies) * 1000, 2),
+                "errors": errors,
+                "status_codes": dict(statuses),
+            }
+        total = sum(endpoint["requests"] for endpoint in endpoints.values())
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2),
+            "endpoints": endpoints,
+        }
+
+
+def _percentile_ms(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * fraction))] * 1000, 2)
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+class Fixture:
+    """Accounts and products the scenarios share."""
+
+    def __init__(self):
+        self.admin_token = ""
+        self.shopper_tokens = []
+        self.products = []
+
+    async def prepare(self, client: httpx.AsyncClient, args) -> None:
+        self.admin_token = await _login(client, args.admin_email, args.admin_password)
+        await self._prepare_products(client, args.products)
+        await self._prepare_shoppers(client, args.shoppers)
+
+    async def _prepare_products(self, client: httpx.AsyncClient, count: int) -> None:
+        for i in range(count):
+            name = f"Bench product {i:04d}"
+            response = await client.get(f"/products/name/{name}")
+            if response.status_code == 404:
+                response = await client.post(
+                    "/inventory/product",
+                    headers=_auth(self.admin_token),
+                    data={"name": name, "description": f"Vintage bench lamp chair {i}", "price": 1000 + i, "stock_quantity": PRODUCT_STOCK},
+                    files={"image_file": (f"bench-{i}.png", PIXEL_PNG, "image/png")},
+                )
+                response.raise_for_status()
+            product = response.json()
+            if product["stock_quantity"] != PRODUCT_STOCK:
+                response = await client.put(
+                    f"/inventory/product/{product['id']}",
+                    headers=_auth(self.admin_token),
+                    data={"stock_quantity": PRODUCT_STOCK},
+                )
+                response.raise_for_status()
+                product = response.json()
+            self.products.append({"id": product["id"], "price": product["price"]})
+
+    async def _prepare_shoppers(self, client: httpx.AsyncClient, count: int) -> None:
+        async def one(i: int) -> str:
+            email = f"bench-shopper-{i}@example.com"
+            response = await client.post("/auth/register", json={
+                "email": email,
+                "username": f"bench_shopper_{i}",
+                "password": SHOPPER_PASSWORD,
+                "shipping_address": f"{i} Benchmark Road",
+            })
+            if response.status_code not in (201, 400):
+                response.raise_for_status()
+            token = await _login(client, email, SHOPPER_PASSWORD)
+            await client.post("/cart/clear", headers=_auth(token))
+            return token
+
+        # A few at a time: every registration and login is a bcrypt call
+        for start in range(0, count, 4):
+            self.shopper_tokens += await asyncio.gather(*(one(i) for i in range(start, min(start + 4, count))))
+
+    def shopper(self, worker: int) -> dict:
+        return _auth(self.shopper_tokens[worker % len(self.shopper_tokens)])
+
+
+def _checkout_payload(fixture: Fixture, rng: random.Random) -> dict:
+    products = rng.sample(fixture.products, rng.randint(1, min(3, len(fixture.products))))
+    return {
+        "items": [{"product_id": p["id"], "quantity": 1, "unit_price": p["price"]} for p in products],
+        "shipping_address": "1 Benchmark Road",
+    }
+
+
+async def browse(client, recorder: Recorder, fixture: Fixture, rng: random.Random, worker: int) -> None:
+    cursor = None
+    for _ in range(rng.randint(1, 3)):
+        params = {"limit": 20, **({"cursor": cursor} if cursor else {})}
+        response = await recorder.request(client, "GET /products/", "GET", "/products/", params=params)
+        cursor = response.json().get("next_cursor") if response is not None and response.status_code == 200 else None
+        if not cursor:
+            break
+    product = rng.choice(fixture.products)
+    await recorder.request(client, "GET /products/{product_id}", "GET", f"/products/{product['id']}")
+    await recorder.request(client, "GET /products/search", "GET", "/products/search", params={"q": rng.choice(SEARCH_TERMS), "limit": 20})
+
+
+async def cart(client, recorder: Recorder, fixture: Fixture, rng: random.Random, worker: int) -> None:
+    headers = fixture.shopper(worker)
+    product = rng.choice(fixture.products)
+    response = await recorder.request(
+        client, "POST /cart/add", "POST", "/cart/add", headers=headers, json={"product_id": product["id"], "quantity": 1}
+    )
+    if response is None or response.status_code != 201:
+        return
+    item_id = response.json()["id"]
+    await recorder.request(
+        client, "PATCH /cart/update-qty/{cart_item_id}", "PATCH", f"/cart/update-qty/{item_id}",
+        headers=headers, json={"quantity": rng.randint(2, 5)},
+    )
+    await recorder.request(client, "GET /cart/", "GET", "/cart/", headers=headers)
+    await recorder.request(client, "DELETE /cart/{cart_item_id}", "DELETE", f"/cart/{item_id}", headers=headers)
+
+
+async def checkout(client, recorder: Recorder, fixture: Fixture, rng: random.Random, worker: int) -> None:
+    await recorder.request(
+        client, "POST /orders/checkout", "POST", "/orders/checkout",
+        headers=fixture.shopper(worker), json=_checkout_payload(fixture, rng),
+    )
+
+
+async def admin(client, recorder: Recorder, fixture: Fixture, rng: random.Random, worker: int) -> None:
+    headers = _auth(fixture.admin_token)
+    cursor = None
+    for _ in range(2):
+        params = {"limit": 50, **({"cursor": cursor} if cursor else {})}
+        response = await recorder.request(client, "GET /admin/orders", "GET", "/admin/orders", headers=headers, params=params)
+        cursor = response.json().get("next_cursor") if response is not None and response.status_code == 200 else None
+        if not cursor:
+            break
+    await recorder.request(client, "GET /admin/users", "GET", "/admin/users", headers=headers, params={"limit": 50})
+    await recorder.request(client, "GET /admin/products", "GET", "/admin/products", headers=headers, params={"limit": 50})
+
+
+class WebhookStorm:
+    """Deliveries for real checkouts; every event is sent --webhook-retries times."""
+
+    def __init__(self, args):
+        self.secret = args.paystack_secret.encode()
+        self.retries = args.webhook_retries
+        self.checkouts = []
+        self._next_id = int(time.time() * 1000)
+
+    async def prepare(self, client: httpx.AsyncClient, fixture: Fixture, count: int, rng: random.Random) -> None:
+        for i in range(count):
+            response = await client.post("/orders/checkout", headers=fixture.shopper(i), json=_checkout_payload(fixture, rng))
+            response.raise_for_status()
+            body = response.json()
+            self.checkouts.append({
+                "reference": body["payment"]["reference"],
+                "order_ids": [order["id"] for order in body["orders"]],
+                "amount": int(body["payment"]["total_amount"] * 100),
+            })
+
+    def _event(self, checkout: dict) -> bytes:
+        self._next_id += 1
+        return json.dumps({
+            "event": "charge.success",
+            "data": {
+                "id": self._next_id,
+                "reference": checkout["reference"],
+                "amount": checkout["amount"],
+                "currency": "NGN",
+                "channel": "card",
+                "status": "success",
+                "paid_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                "metadata": {"order_ids": checkout["order_ids"]},
+            },
+        }).encode()
+
+    async def __call__(self, client, recorder: Recorder, fixture: Fixture, rng: random.Random, worker: int) -> None:
+        body = self._event(rng.choice(self.checkouts))
+        headers = {
+            "Content-Type": "application/json",
+            "x-paystack-signature": hmac.new(self.secret, body, hashlib.sha512).hexdigest(),
+        }
+        for _ in range(self.retries):
+            await recorder.request(client, "POST /payments/webhook", "POST", "/payments/webhook", content=body, headers=headers)
+
+    async def drain_seconds(self, client: httpx.AsyncClient, fixture: Fixture, timeout: float) -> Optional[float]:
+        """Time until no event is pending, or None if it did not drain within timeout."""
+        start = time.perf_counter()
+        while time.perf_counter() - start < timeout:
+            response = await client.get("/admin/webhooks/stats", headers=_auth(fixture.admin_token))
+            if response.status_code == 200 and not response.json()["events"].get("pending"):
+                return round(time.perf_counter() - start, 3)
+            await asyncio.sleep(0.1)
+        return None
+
+
+async def run_scenario(client, scenario, fixture: Fixture, args, seed: int) -> dict:
+    recorder = Recorder()
+    deadline = time.perf_counter() + args.duration
+
+    async def worker(i: int):
+        rng = random.Random(seed * 1000 + i)
+        while time.perf_counter() < deadline:
+            await scenario(client, recorder, fixture, rng, i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    return recorder.report(time.perf_counter() - start)
+
+
+def _git(*command: str) -> str:
+    try:
+        return subprocess.run(["git", *command], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _metadata(args) -> dict:
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": args.url,
+        "python": platform.python_version(),
+        "settings": {
+            "scenarios": args.scenarios,
+            "duration_seconds": args.duration,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "products": args.products,
+            "shoppers": args.shoppers,
+            "webhook_checkouts": args.webhook_checkouts,
+            "webhook_retries": args.webhook_retries,
+        },
+    }
+
+
+async def run(args) -> dict:
+    results = {"meta": _metadata(args), "scenarios": {}}
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        fixture = Fixture()
+        await fixture.prepare(client, args)
+
+        for index, name in enumerate(args.scenarios):
+            scenario = globals()[name] if name != "webhooks" else WebhookStorm(args)
+            if name == "webhooks":
+                await scenario.prepare(client, fixture, args.webhook_checkouts, random.Random(args.seed))
+            # Let the previous scenario's background work settle first
+            await asyncio.sleep(args.pause)
+            print(f"{name}: {args.concurrency} workers for {args.duration:g}s", file=sys.stderr)
+            report = await run_scenario(client, scenario, fixture, args, args.seed + index)
+            if name == "webhooks":
+                report["drain_seconds"] = await scenario.drain_seconds(client, fixture, args.drain_timeout)
+            results["scenarios"][name] = report
+    return results
+
+
+def _print_results(results: dict) -> None:
+    for name, scenario in results["scenarios"].items():
+        print(f"\n{name}: {scenario['requests']} requests, {scenario['throughput_rps']} req/s")
+        if "drain_seconds" in scenario:
+            print(f"  inbox drained in {scenario['drain_seconds']}s")
+        for endpoint, stats in scenario["endpoints"].items():
+            print(
+                f"  {endpoint:<38} n={stats['requests']:<6} {stats['throughput_rps']:8.1f} req/s "
+                f"p50={stats['p50_ms']:8.1f}ms p95={stats['p95_ms']:8.1f}ms p99={stats['p99_ms']:8.1f}ms "
+                f"errors={stats['errors']}"
+            )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> int:
+    """Print the change per endpoint against a baseline run; returns the number of regressions."""
+    base_commit = baseline["meta"].get("commit", "")[:10] or "baseline"
+    print(f"\nCompared with {base_commit} (regression threshold {threshold:g}%)")
+    regressions = 0
+    for name, scenario in results["scenarios"].items():
+        base_endpoints = baseline["scenarios"].get(name, {}).get("endpoints", {})
+        for endpoint, stats in scenario["endpoints"].items():
+            base = base_endpoints.get(endpoint)
+            if not base:
+                print(f"  {name:<9} {endpoint:<38} new")
+                continue
+            p95_change = (stats["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100 if base["p95_ms"] else 0.0
+            rps_change = (stats["throughput_rps"] - base["throughput_rps"]) / base["throughput_rps"] * 100 if base["throughput_rps"] else 0.0
+            regressed = p95_change > threshold or rps_change < -threshold
+            regressions += regressed
+            print(
+                f"  {name:<9} {endpoint:<38} p95 {base['p95_ms']:8.1f} -> {stats['p95_ms']:8.1f}ms ({p95_change:+6.1f}%) "
+                f"req/s {base['throughput_rps']:8.1f} -> {stats['throughput_rps']:8.1f} ({rps_change:+6.1f}%)"
+                f"{'  REGRESSION' if regressed else ''}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--admin-email", required=True)
+    parser.add_argument("--admin-password", required=True)
+    parser.add_argument("--paystack-secret", default=os.getenv("PAYSTACK_SECRET_KEY", ""),
+                        help="The server's PAYSTACK_SECRET_KEY, to sign webhook deliveries")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--products", type=int, default=50, help="Benchmark products to create or reuse")
+    parser.add_argument("--shoppers", type=int, default=20, help="Shopper accounts to create or reuse")
+    parser.add_argument("--webhook-checkouts", type=int, default=50, help="Checkouts the webhook storm settles")
+    parser.add_argument("--webhook-retries", type=int, default=3, help="Deliveries of each webhook event")
+    parser.add_argument("--drain-timeout", type=float, default=60.0)
+    parser.add_argument("--pause", type=float, default=2.0, help="Seconds between scenarios")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    if "webhooks" in args.scenarios and not args.paystack_secret:
+        parser.error("the webhooks scenario needs --paystack-secret or PAYSTACK_SECRET_KEY")
+
+    results = asyncio.run(run(args))
+    _print_results(results)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
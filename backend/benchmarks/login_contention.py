@@ -0,0 +1,97 @@
+"""
+Measure catalog latency while /auth/login is under load.
+
+Runs a steady stream of GET /products/ requests alongside a burst of
+concurrent logins and reports p50/p99 for the catalog plus the login status
+codes (503s mean the bcrypt pool shed load). Run it against a server once
+with PASSWORD_HASH_WORKERS=0 (in-process bcrypt) and once with the pool:
+
+    python -m benchmarks.login_contention --url http://127.0.0.1:8000 \\
+        --email user@example.com --password 'Secret123!' --logins 200 --login-concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+
+def _percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def _catalog_probe(client: httpx.AsyncClient, stop: asyncio.Event, interval: float, latencies: list, errors: Counter):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            response = await client.get("/products/", params={"limit": 20})
+            if response.status_code != 200:
+                errors[response.status_code] += 1
+        except httpx.HTTPError as e:
+            errors[type(e).__name__] += 1
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+
+
+async def _login_burst(client: httpx.AsyncClient, email: str, password: str, total: int, concurrency: int, codes: Counter):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            try:
+                response = await client.post("/auth/login", json={"email": email, "password": password})
+                codes[response.status_code] += 1
+            except httpx.HTTPError as e:
+                codes[type(e).__name__] += 1
+
+    await asyncio.gather(*(one() for _ in range(total)))
+
+
+async def run(args) -> None:
+    limits = httpx.Limits(max_connections=args.login_concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        baseline, errors = [], Counter()
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_catalog_probe(client, stop, args.probe_interval, baseline, errors))
+        await asyncio.sleep(args.warmup)
+        stop.set()
+        await probe
+
+        loaded, codes = [], Counter()
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_catalog_probe(client, stop, args.probe_interval, loaded, errors))
+        start = time.perf_counter()
+        await _login_burst(client, args.email, args.password, args.logins, args.login_concurrency, codes)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    for name, latencies in (("idle", baseline), ("during logins", loaded)):
+        if latencies:
+            print(
+                f"/products/ {name:<14} n={len(latencies):<5} "
+                f"p50={statistics.median(latencies) * 1000:8.1f}ms p99={_percentile(latencies, 0.99) * 1000:8.1f}ms"
+            )
+    print(f"/auth/login x{args.logins} in {elapsed:.2f}s, status codes: {dict(codes)}")
+    if errors:
+        print(f"/products/ errors: {dict(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--login-concurrency", type=int, default=50)
+    parser.add_argument("--probe-interval", type=float, default=0.05, help="Seconds between catalog requests")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of idle catalog baseline")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
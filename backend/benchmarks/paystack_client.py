@@ -0,0 +1,82 @@
+"""
+Benchmark the Paystack client path against benchmarks/fake_paystack.py.
+
+Compares a fresh connection per call (the old requests.post behaviour) with
+the pooled sync client and the pooled async client under concurrency:
+
+    python -m benchmarks.fake_paystack --port 8081 --latency-ms 50 &
+    PAYSTACK_BASE_URL=http://127.0.0.1:8081 python -m benchmarks.paystack_client -n 200 -c 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.services import payment_service
+
+
+def _summary(name: str, latencies: list, elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{name:<22} calls={len(latencies):<5} total={elapsed:7.3f}s "
+        f"p50={statistics.median(latencies) * 1000:7.2f}ms p95={p95 * 1000:7.2f}ms "
+        f"rps={len(latencies) / elapsed:8.1f}"
+    )
+
+
+def bench_unpooled(n: int) -> None:
+    latencies = []
+    start = time.perf_counter()
+    for i in range(n):
+        t = time.perf_counter()
+        with httpx.Client(base_url=payment_service.PAYSTACK_BASE_URL, headers=payment_service.HEADERS) as client:
+            client.post("/transaction/initialize", json={"email": "bench@example.com", "amount": 100})
+        latencies.append(time.perf_counter() - t)
+    _summary("unpooled (sync)", latencies, time.perf_counter() - start)
+
+
+def bench_pooled(n: int) -> None:
+    latencies = []
+    start = time.perf_counter()
+    for i in range(n):
+        t = time.perf_counter()
+        result = payment_service.initialize_payment("bench@example.com", 1.0, [i])
+        assert result["status"], result
+        latencies.append(time.perf_counter() - t)
+    _summary("pooled (sync)", latencies, time.perf_counter() - start)
+
+
+async def bench_pooled_async(n: int, concurrency: int) -> None:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            t = time.perf_counter()
+            result = await payment_service.initialize_payment_async("bench@example.com", 1.0, [i])
+            assert result["status"], result
+            latencies.append(time.perf_counter() - t)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    _summary(f"pooled (async, c={concurrency})", latencies, time.perf_counter() - start)
+    await payment_service.close_clients()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--calls", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Target: {payment_service.PAYSTACK_BASE_URL}")
+    bench_unpooled(args.calls)
+    bench_pooled(args.calls)
+    asyncio.run(bench_pooled_async(args.calls, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
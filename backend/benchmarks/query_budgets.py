@@ -0,0 +1,108 @@
+"""
+Check SQL query budgets per endpoint.
+
+Every response carries a Server-Timing header with the number of statements
+the request ran (see app.core.metrics). This calls each endpoint in BUDGETS
+against a running server and fails if any of them runs more queries than its
+budget, so a lazy relationship sneaking into a response model shows up as a
+failed check rather than a slow page:
+
+    python -m benchmarks.query_budgets --url http://127.0.0.1:8000 \\
+        --email user@example.com --password 'Secret123!'
+
+Cached endpoints are called twice and budgeted on the second call. Endpoints
+that need a login are skipped without --email/--password; admin ones are
+skipped unless that user is an admin. Exits 1 when a budget is exceeded.
+"""
+import argparse
+import re
+import sys
+from typing import Optional
+
+import httpx
+
+# (path, max queries, needs login, needs admin); {product_id} and {order_id}
+# are filled in from the first product and the user's latest order
+BUDGETS = [
+    ("/health", 1, False, False),
+    ("/products/?limit=50", 2, False, False),
+    ("/products/search?q=a&limit=50", 2, False, False),
+    ("/products/{product_id}", 1, False, False),
+    ("/cart/", 2, True, False),
+    ("/orders/history", 2, True, False),
+    ("/orders/{order_id}", 1, True, False),
+    ("/admin/orders?limit=50", 2, True, True),
+    ("/admin/users?limit=50", 2, True, True),
+    ("/admin/products?limit=50", 2, True, True),
+]
+
+_DB_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def queries_from_server_timing(header: str) -> Optional[int]:
+    match = _DB_TIMING.search(header or "")
+    return int(match.group(1)) if match else None
+
+
+def _login(client: httpx.Client, email: str, password: str) -> dict:
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _placeholders(client: httpx.Client, headers: dict) -> dict:
+    values = {}
+    products = client.get("/products/", params={"limit": 1}).json().get("items", [])
+    if products:
+        values["product_id"] = products[0]["id"]
+    if headers:
+        orders = client.get("/orders/history", headers=headers).json()
+        if orders:
+            values["order_id"] = orders[0]["id"]
+    return values
+
+
+def run(args) -> int:
+    failures = 0
+    with httpx.Client(base_url=args.url, timeout=args.timeout) as client:
+        headers = _login(client, args.email, args.password) if args.email else {}
+        is_admin = bool(headers) and client.get("/admin/cache/stats", headers=headers).status_code == 200
+        values = _placeholders(client, headers)
+
+        for path, budget, needs_login, needs_admin in BUDGETS:
+            if (needs_login and not headers) or (needs_admin and not is_admin):
+                print(f"SKIP {path}: needs {'an admin' if needs_admin else 'a'} login")
+                continue
+            try:
+                url = path.format(**values)
+            except KeyError as e:
+                print(f"SKIP {path}: no {e.args[0]} to test with")
+                continue
+
+            # The first call may fill a cache; budget the steady state
+            client.get(url, headers=headers)
+            response = client.get(url, headers=headers)
+            queries = queries_from_server_timing(response.headers.get("server-timing"))
+            if response.status_code >= 400 or queries is None:
+                print(f"FAIL {url}: status {response.status_code}, Server-Timing {response.headers.get('server-timing')!r}")
+                failures += 1
+            elif queries > budget:
+                print(f"FAIL {url}: {queries} queries, budget {budget}")
+                failures += 1
+            else:
+                print(f"ok   {url}: {queries} queries, budget {budget}")
+
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,13 @@
 import os
 import multiprocessing
+import shutil
+
+# Prometheus multiprocess mode: must be set, and emptied of samples from a
+# previous run, before preload_app imports the app (and prometheus_client)
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/vintique-prometheus")
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
 from app.config import settings
 
 # Server socket - use Render's dynamic PORT
@@ -39,8 +47,21 @@ def on_starting(server):
 def when_ready(server):
     server.log.info("Server is ready.")
 
+def post_fork(server, worker):
+    # preload_app creates the engines in the master; give each worker its own
+    # pools. close=False leaves the master's sockets alone instead of closing
+    # connections that are shared with it.
+    from app.database import dispose_engines
+    dispose_engines(close=False)
+    server.log.info(f"Worker spawned (pid: {worker.pid}), database pools reset")
+
 def worker_exit(server, worker):
     server.log.info(f"Worker exited (pid: {worker.pid})")
 
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (in-flight requests, pool connections)
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
 def on_exit(server):
     server.log.info("Server is shutting down...")
\ No newline at end of file
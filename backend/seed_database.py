@@ -1,12 +1,25 @@
 #!/usr/bin/env python3
 """
 Database seeding script for Vintique PostgreSQL
-Run this script to populate your database with initial sample data
+Run this script to populate your database with initial sample data:
+
+    python seed_database.py
+
+or with a production-sized synthetic dataset for capacity planning and
+realistic query plans (see generate_large_dataset):
+
+    python seed_database.py --large --users 1000000 --products 200000 --orders 10000000 --seed 42
 """
 
+import argparse
+import io
+import itertools
+import random
 import sys
 import os
-from datetime import datetime
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 # Add the project root to Python path
@@ -14,7 +27,8 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.database import SessionLocal, engine
 from app.models import User, Account, Product, Cart, Order, Transaction, Guest
-from app.core.security import get_password_hash
+from app.core.auth import get_password_hash
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 def seed_database():
@@ -238,5 +252,395 @@ def seed_database():
     finally:
         db.close()
 
+
+
+# ---------------------------------------------------------------------------
+# Large synthetic dataset
+# ---------------------------------------------------------------------------
+
+ADJECTIVES = ("Vintage", "Antique", "Retro", "Classic", "Rare", "Handmade", "Restored", "Mid-Century", "Victorian", "Art Deco")
+ITEMS = (
+    "Leather Jacket", "Pocket Watch", "Denim Jeans", "Sunglasses", "Vinyl Record", "Brass Lamp", "Wool Coat",
+    "Silk Scarf", "Film Camera", "Typewriter", "Teapot", "Armchair", "Wall Mirror", "Radio", "Handbag", "Bicycle",
+)
+MATERIALS = ("leather", "brass", "oak", "silver", "wool", "silk", "glass", "porcelain", "walnut", "copper")
+CONDITIONS = ("excellent condition", "fully restored", "light wear", "original packaging", "collector's grade", "working order")
+STREETS = ("Oak Ave", "Pine Rd", "Elm St", "Main St", "Broad St", "Marina Rd", "Allen Ave", "Awolowo Rd")
+CITIES = ("Lagos", "Abuja", "Ibadan", "Kano", "Port Harcourt", "Enugu", "Benin City", "Kaduna")
+
+# Orders older than RECENT_ORDER_DAYS have mostly run their course
+RECENT_ORDER_DAYS = 30
+OLD_ORDER_STATUSES = (("completed", 80), ("delivered", 5), ("cancelled", 7), ("failed", 8))
+RECENT_ORDER_STATUSES = (
+    ("pending", 20), ("paid", 20), ("processing", 15), ("shipped", 20), ("delivered", 15), ("failed", 5), ("cancelled", 5)
+)
+# Paystack status of the checkout's transactions; every other order status was paid
+UNPAID_TRANSACTION_STATUS = {"pending": "pending", "failed": "failed", "cancelled": "abandoned"}
+CHANNELS = ("card", "card", "card", "bank_transfer", "ussd")
+
+LARGE_TABLES = ("transactions", "orders", "cart", "accounts", "guests", "webhook_events", "products", "users")
+
+
+def _timestamp(epoch: float) -> str:
+    return datetime.fromtimestamp(int(epoch), tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00")
+
+
+def _money(cents: int) -> str:
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+def _skewed_time(rng: random.Random, start: float, end: float) -> float:
+    """A time in [start, end), denser towards end (activity grows over time)."""
+    return end - (end - start) * rng.random() ** 2
+
+
+def _address(user_id: int) -> str:
+    return f"{user_id % 997 + 1} {STREETS[user_id % len(STREETS)]}, {CITIES[user_id // 7 % len(CITIES)]}"
+
+
+def _popularity(rng: random.Random, ids: range, exponent: float):
+    """
+    IDs shuffled into a random popularity order with Zipf-like cumulative
+    weights, for rng.choices: a few users and products get most of the
+    orders, as in production.
+    """
+    ranked = list(ids)
+    rng.shuffle(ranked)
+    weights = itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(len(ranked)))
+    return ranked, list(weights)
+
+
+def _statuses(table) -> tuple:
+    names = [name for name, _ in table]
+    return names, list(itertools.accumulate(weight for _, weight in table))
+
+
+def _copy(cursor, table: str, columns: str, lines, chunk_size: int) -> int:
+    """Stream preformatted COPY text lines into table, chunk_size rows per COPY."""
+    total = 0
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return total
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", io.StringIO("".join(chunk)))
+        total += len(chunk)
+
+
+def _next_id(cursor, table: str) -> int:
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def _sync_sequence(cursor, table: str) -> None:
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+    )
+
+
+def _drop_load_overhead(cursor, tables) -> list:
+    """
+    Drop the non-unique indexes and foreign keys of tables and return the
+    statements that restore them. Building indexes and validating foreign
+    keys once after the load is far cheaper than doing it row by row
+    during COPY.
+    """
+    cursor.execute(
+        "SELECT i.indexname, i.indexdef FROM pg_indexes i"
+        " JOIN pg_class c ON c.relname = i.indexname"
+        " JOIN pg_index x ON x.indexrelid = c.oid"
+        " WHERE i.schemaname = current_schema() AND i.tablename = ANY(%s) AND NOT x.indisunique",
+        (list(tables),),
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint"
+        " WHERE contype = 'f' AND conrelid::regclass::text = ANY(%s)",
+        (list(tables),),
+    )
+    foreign_keys = cursor.fetchall()
+
+    for table, name, _ in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+    return [definition for _, definition in indexes] + [
+        f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}' for table, name, definition in foreign_keys
+    ]
+
+
+def generate_large_dataset(
+    users: int,
+    products: int,
+    orders: int,
+    carts: int,
+    guests: int = 0,
+    seed: int = 42,
+    as_of: datetime = None,
+    years: float = 3.0,
+    chunk_size: int = 50_000,
+    truncate: bool = False,
+) -> None:
+    """
+    Bulk-load a synthetic dataset through COPY FROM STDIN.
+
+    Rows are generated in Python and streamed in chunk_size batches, so
+    memory stays flat apart from a few per-user and per-product arrays.
+    Every table has its own RNG derived from seed, so the same arguments
+    (including as_of) on an empty database produce the same rows.
+
+    - users: 97% active; sign-ups spread over `years`, denser recently;
+      all share the password "password123" (hashed once)
+    - products: 2% soft-deleted, 5% out of stock, prices skewed low
+    - orders: checkouts of one to three products by Zipf-distributed users
+      and products; old orders are mostly completed, recent ones spread
+      over the whole lifecycle; one transaction per order, shared by the
+      checkout's orders as Paystack references are
+    - cart: distinct (user, product) pairs with the same skew
+
+    New rows get IDs after the current maximum, and sequences are moved
+    past them. With truncate=True every application table is emptied first.
+    Non-unique indexes and foreign keys are dropped for the load and
+    restored (and validated) at the end.
+    """
+    as_of = as_of or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    end = as_of.timestamp()
+    start = end - years * 365 * 86400
+    password_hash = get_password_hash("password123")
+
+    connection = engine.raw_connection()
+    restore_statements = []
+    try:
+        cursor = connection.cursor()
+        # Losing the tail of a crashed seed run is fine; waiting on WAL flushes is not
+        cursor.execute("SET synchronous_commit TO off")
+        cursor.execute("SET maintenance_work_mem TO '512MB'")
+        if truncate:
+            print("🧹 Truncating application tables...")
+            cursor.execute(f"TRUNCATE {', '.join(LARGE_TABLES)} RESTART IDENTITY CASCADE")
+        restore_statements = _drop_load_overhead(cursor, LARGE_TABLES)
+        connection.commit()
+
+        def load(table: str, columns: str, lines) -> None:
+            started = time.perf_counter()
+            count = _copy(cursor, table, columns, lines, chunk_size)
+            _sync_sequence(cursor, table)
+            connection.commit()
+            elapsed = time.perf_counter() - started
+            print(f"   {table:<13} {count:>11,} rows in {elapsed:7.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)")
+
+        print(f"🌱 Generating synthetic data (seed {seed}, as of {as_of:%Y-%m-%d})...")
+
+        # Users and their accounts
+        first_user = _next_id(cursor, "users")
+        user_ids = range(first_user, first_user + users)
+        rng = random.Random(f"{seed}:users")
+        user_created = [_skewed_time(rng, start, end) for _ in user_ids]
+
+        def user_lines():
+            for user_id, created in zip(user_ids, user_created):
+                roll = rng.random()
+                status = "active" if roll < 0.97 else "inactive" if roll < 0.99 else "suspended"
+                ts = _timestamp(created)
+                yield (
+                    f"{user_id}\tuser{user_id}@example.com\tuser_{user_id}\t{password_hash}\t{_address(user_id)}"
+                    f"\tf\t{status}\t{ts}\t{ts}\n"
+                )
+
+        load("users", "id, email, username, password, shipping_address, is_admin, status, created_at, updated_at", user_lines())
+
+        rng = random.Random(f"{seed}:accounts")
+        load("accounts", "user_id, balance, created_at, updated_at", (
+            f"{user_id}\t{_money(int(rng.expovariate(1 / 2_000_000)))}\t{_timestamp(created)}\t{_timestamp(created)}\n"
+            for user_id, created in zip(user_ids, user_created)
+        ))
+
+        # Products
+        first_product = _next_id(cursor, "products")
+        product_ids = range(first_product, first_product + products)
+        rng = random.Random(f"{seed}:products")
+        # Most items cost a few thousand naira, with a long tail of expensive ones
+        product_price = [int(100_000 * rng.lognormvariate(1.0, 1.1)) + 100_000 for _ in product_ids]
+        product_created = [_skewed_time(rng, start, end) for _ in product_ids]
+
+        def product_lines():
+            for product_id, price, created in zip(product_ids, product_price, product_created):
+                adjective, item, material = rng.choice(ADJECTIVES), rng.choice(ITEMS), rng.choice(MATERIALS)
+                decade = rng.randrange(1900, 2000, 10)
+                stock = 0 if rng.random() < 0.05 else min(int(rng.paretovariate(1.5)), 10_000)
+                deleted = "t" if rng.random() < 0.02 else "f"
+                ts = _timestamp(created)
+                yield (
+                    f"{product_id}\t{adjective} {item} #{product_id}"
+                    f"\t{adjective} {material} {item.lower()} from the {decade}s, {rng.choice(CONDITIONS)}."
+                    f"\t{_money(price)}\t{stock}\thttps://res.cloudinary.com/vintique/image/upload/v1/vintique/products/{product_id}.jpg"
+                    f"\t{deleted}\t{ts}\t{ts}\n"
+                )
+
+        load(
+            "products",
+            "id, name, description, price, stock_quantity, image_url, is_deleted, created_at, updated_at",
+            product_lines(),
+        )
+
+        # Orders and their transactions, one checkout at a time
+        rng = random.Random(f"{seed}:orders")
+        ranked_users, user_weights = _popularity(rng, user_ids, 0.8)
+        ranked_products, product_weights = _popularity(rng, product_ids, 1.1)
+        old_statuses, old_weights = _statuses(OLD_ORDER_STATUSES)
+        recent_statuses, recent_weights = _statuses(RECENT_ORDER_STATUSES)
+        recent_cutoff = end - RECENT_ORDER_DAYS * 86400
+        first_order = _next_id(cursor, "orders")
+        started = time.perf_counter()
+        order_id = first_order
+        remaining = orders
+        while remaining > 0:
+            order_lines, transaction_lines = [], []
+            batch = min(chunk_size, remaining)
+            # Draw users and products for the whole batch at once; much faster than one by one
+            buyers = rng.choices(ranked_users, cum_weights=user_weights, k=batch)
+            items = iter(rng.choices(ranked_products, cum_weights=product_weights, k=batch))
+            for user_id in buyers:
+                if len(order_lines) >= batch:
+                    break
+                size = min(batch - len(order_lines), 1 if rng.random() < 0.7 else rng.randint(2, 3))
+                user_created_at = user_created[user_id - first_user]
+                created = rng.uniform(user_created_at, end)
+                if created >= recent_cutoff:
+                    status = rng.choices(recent_statuses, cum_weights=recent_weights)[0]
+                else:
+                    status = rng.choices(old_statuses, cum_weights=old_weights)[0]
+                paid = status not in UNPAID_TRANSACTION_STATUS
+                paid_at = _timestamp(created + rng.uniform(30, 900)) if paid else "\\N"
+                updated = _timestamp(created + rng.uniform(900, 14 * 86400)) if status != "pending" else _timestamp(created)
+                created_ts = _timestamp(created)
+                reference = f"SEED{seed}-{order_id}"
+                transaction_status = UNPAID_TRANSACTION_STATUS.get(status, "success")
+                channel = rng.choice(CHANNELS) if paid else "\\N"
+                address = _address(user_id)
+                for _ in range(size):
+                    product_id = next(items)
+                    quantity = 1 if rng.random() < 0.85 else rng.randint(2, 4)
+                    price = product_price[product_id - first_product]
+                    order_lines.append(
+                        f"{order_id}\t{product_id}\t{user_id}\t{_money(price * quantity)}\t{quantity}\t{_money(price)}"
+                        f"\t{status}\t{address}\t{paid_at}\t{created_ts}\t{updated}\n"
+                    )
+                    transaction_lines.append(
+                        f"{order_id}\t{reference}\t{transaction_status}\t{_money(price * quantity)}\tNGN"
+                        f"\t{channel}\t{paid_at}\t{created_ts}\t{updated}\n"
+                    )
+                    order_id += 1
+
+            cursor.copy_expert(
+                "COPY orders (id, product_id, user_id, amount, quantity, unit_price, order_status, shipping_address,"
+                " stock_deducted_at, created_at, updated_at) FROM STDIN",
+                io.StringIO("".join(order_lines)),
+            )
+            cursor.copy_expert(
+                "COPY transactions (order_id, reference, status, amount, currency, channel, paid_at, created_at, updated_at)"
+                " FROM STDIN",
+                io.StringIO("".join(transaction_lines)),
+            )
+            remaining -= len(order_lines)
+        _sync_sequence(cursor, "orders")
+        _sync_sequence(cursor, "transactions")
+        connection.commit()
+        elapsed = time.perf_counter() - started
+        print(
+            f"   {'orders':<13} {orders:>11,} rows in {elapsed:7.1f}s ({orders / max(elapsed, 1e-9):,.0f} rows/s, "
+            f"with as many transactions)"
+        )
+
+        # Open carts: distinct (user, product) pairs, same skew as orders
+        rng = random.Random(f"{seed}:cart")
+        pairs = set()
+        for _ in range(20):
+            missing = carts - len(pairs)
+            if missing <= 0:
+                break
+            pairs.update(zip(
+                rng.choices(ranked_users, cum_weights=user_weights, k=missing),
+                rng.choices(ranked_products, cum_weights=product_weights, k=missing),
+            ))
+        cart_start = end - 14 * 86400
+
+        def cart_lines():
+            for user_id, product_id in itertools.islice(sorted(pairs), carts):
+                quantity = 1 if rng.random() < 0.8 else rng.randint(2, 5)
+                ts = _timestamp(_skewed_time(rng, cart_start, end))
+                yield f"{user_id}\t{product_id}\t{quantity}\t{ts}\t{ts}\n"
+
+        load("cart", "user_id, product_id, quantity, created_at, updated_at", cart_lines())
+
+        if guests:
+            rng = random.Random(f"{seed}:guests")
+
+            def guest_lines():
+                for _ in range(guests):
+                    ts = _timestamp(_skewed_time(rng, end - 30 * 86400, end))
+                    yield f"{uuid.UUID(int=rng.getrandbits(128), version=4)}\t{ts}\t{ts}\n"
+
+            load("guests", "guest_id, created_at, updated_at", guest_lines())
+
+        print(f"🗂️  Rebuilding {len(restore_statements)} indexes and foreign keys...")
+        started = time.perf_counter()
+        for statement in restore_statements:
+            cursor.execute(statement)
+        restore_statements = []
+        connection.commit()
+        print(f"   done in {time.perf_counter() - started:.1f}s")
+
+        print("📈 Analyzing tables...")
+        for table in LARGE_TABLES:
+            cursor.execute(f"ANALYZE {table}")
+        connection.commit()
+        print("✅ Synthetic data generated. Every generated user's password is password123")
+    except Exception as e:
+        print(f"❌ Error generating data: {e}")
+        connection.rollback()
+        raise
+    finally:
+        if restore_statements:
+            # Never leave the schema without its indexes and keys, even after a failed load
+            cursor = connection.cursor()
+            for statement in restore_statements:
+                cursor.execute(statement)
+            connection.commit()
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--large", action="store_true", help="Generate a synthetic dataset instead of the sample data")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--orders", type=int, default=10_000_000)
+    parser.add_argument("--carts", type=int, default=500_000)
+    parser.add_argument("--guests", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=lambda value: datetime.fromisoformat(value).replace(tzinfo=timezone.utc),
+                        help="Date the data ends at (YYYY-MM-DD); defaults to today, so pin it for identical runs")
+    parser.add_argument("--years", type=float, default=3.0, help="History covered by the data")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows per COPY")
+    parser.add_argument("--truncate", action="store_true", help="Empty all application tables first")
+    args = parser.parse_args()
+
+    if not args.large:
+        seed_database()
+        return
+    generate_large_dataset(
+        users=args.users,
+        products=args.products,
+        orders=args.orders,
+        carts=args.carts,
+        guests=args.guests,
+        seed=args.seed,
+        as_of=args.as_of,
+        years=args.years,
+        chunk_size=args.chunk_size,
+        truncate=args.truncate,
+    )
+
+
 if __name__ == "__main__":
-    seed_database()
+    main()
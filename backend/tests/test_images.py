@@ -0,0 +1,83 @@
+import io
+import struct
+import zlib
+
+import pytest
+from PIL import Image
+
+from app.utils.images import MAX_IMAGE_PIXELS, ImageInfo, sniff_image
+
+
+# Minimal EXIF block; metadata makes the WebP encoder write an extended (VP8X) file
+EXIF = b"Exif\0\0MM\0*\0\0\0\x08\0\0"
+
+
+def _encode(image_format: str, size=(40, 30), **options) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "red").save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def _png_header(width: int, height: int) -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = b"IHDR" + ihdr
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", len(ihdr)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+@pytest.mark.parametrize("data, expected", [
+    (_encode("PNG"), ImageInfo("png", 40, 30)),
+    (_encode("JPEG"), ImageInfo("jpeg", 40, 30)),
+    (_encode("JPEG", progressive=True), ImageInfo("jpeg", 40, 30)),
+    # ICC profile split over two APP2 segments, well past the first 64 KB
+    (_encode("JPEG", icc_profile=b"\0" * 100_000), ImageInfo("jpeg", 40, 30)),
+    (_encode("WEBP", quality=80), ImageInfo("webp", 40, 30)),
+    (_encode("WEBP", lossless=True), ImageInfo("webp", 40, 30)),
+    (_encode("WEBP", quality=80, exif=EXIF), ImageInfo("webp", 40, 30)),
+])
+def test_sniff_image_reads_dimensions(data, expected):
+    assert sniff_image(io.BytesIO(data)) == expected
+
+
+def test_webp_variants_are_covered():
+    chunks = {
+        _encode("WEBP", quality=80)[12:16],
+        _encode("WEBP", lossless=True)[12:16],
+        _encode("WEBP", quality=80, exif=EXIF)[12:16],
+    }
+    assert chunks == {b"VP8 ", b"VP8L", b"VP8X"}
+
+
+def test_jpeg_metadata_is_skipped_not_read():
+    data = _encode("JPEG", icc_profile=b"\0" * 100_000)
+    file = io.BytesIO(data)
+    reads = []
+    original_read = file.read
+    file.read = lambda size=-1: reads.append(size) or original_read(size)
+
+    sniff_image(file)
+
+    assert -1 not in reads
+    assert sum(reads) < 100
+
+
+def test_sniff_image_starts_at_current_position():
+    file = io.BytesIO(b"prefix" + _encode("JPEG"))
+    file.seek(6)
+    assert sniff_image(file) == ImageInfo("jpeg", 40, 30)
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"GIF89a" + b"\0" * 40, "Invalid file type"),
+    (b"", "Invalid file type"),
+    (_encode("JPEG")[:20], "Corrupt JPEG header"),
+    (_png_header(10_000, 10_000), "Image too large"),
+    (_png_header(0, 10), "Invalid PNG dimensions"),
+])
+def test_sniff_image_rejects(data, message):
+    with pytest.raises(ValueError, match=message):
+        sniff_image(io.BytesIO(data))
+
+
+def test_pixel_limit_boundary():
+    assert 10_000 * 10_000 > MAX_IMAGE_PIXELS
+    assert sniff_image(io.BytesIO(_png_header(5_000, 10_000))) == ImageInfo("png", 5_000, 10_000)
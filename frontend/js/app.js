@@ -29,6 +29,21 @@ async function apiFetch(endpoint, options = {}) {
   }
 }
 
+// Follows next_cursor on paginated list endpoints and returns every item
+async function apiFetchAll(endpoint, params = {}) {
+  const items = [];
+  let cursor = null;
+  do {
+    const q = new URLSearchParams({ ...params, ...(cursor ? { cursor } : {}) });
+    const qs = q.toString();
+    const page = await apiFetch(`${endpoint}${qs ? "?" + qs : ""}`);
+    if (!page) break;
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+}
+
 // ── AUTH ────────────────────────────────────────────────────────────────────
 function getToken() {
   const token = localStorage.getItem("vintique_token");
@@ -270,8 +285,8 @@ const cart = {
     if (!isLoggedIn()) return;
 
     try {
-      const serverItems = await apiFetch("/cart");
-      const items = serverItems.map((i) => ({
+      const cart = await apiFetch("/cart/");
+      const items = cart.items.map((i) => ({
         id: i.product_id,
         name: i.product.name,
         price: i.product.price,
@@ -289,12 +304,15 @@ const cart = {
 // ── PRODUCTS API ─────────────────────────────────────────────────────────
 const productsAPI = {
   getAll(params = {}) {
-    const q = new URLSearchParams(params).toString();
-    return apiFetch(`/products${q ? "?" + q : ""}`);
+    return apiFetchAll("/products/", params);
   },
   getOne(id) {
     return apiFetch(`/products/${id}`);
   },
+  search(q, params = {}) {
+    const qs = new URLSearchParams({ q, ...params }).toString();
+    return apiFetch(`/products/search?${qs}`);
+  },
 };
 
 // ── ORDERS API ───────────────────────────────────────────────────────────────
@@ -313,13 +331,13 @@ const ordersAPI = {
 // ── ADMIN API ─────────────────────────────────────────────────────────────────
 const adminAPI = {
   getOrders() {
-    return apiFetch("/admin/orders");
+    return apiFetchAll("/admin/orders");
   },
   getUsers() {
-    return apiFetch("/admin/users");
+    return apiFetchAll("/admin/users");
   },
   getProducts() {
-    return apiFetch("/admin/products");
+    return apiFetchAll("/admin/products");
   },
 
   makeUserAdmin(id) {
@@ -356,11 +374,44 @@ const adminAPI = {
   //   });
   // },
 
-  createProduct(formData) {
+  // Uploads the image straight to Cloudinary with a signature from the API, so
+  // the product request carries only the upload's public_id/version/signature
+  async uploadImage(file) {
+    const signed = await apiFetch("/inventory/product/image-signature", {
+      method: "POST",
+    });
+    const { upload_url, ...fields } = signed;
+    const body = new FormData();
+    Object.entries(fields).forEach(([key, value]) => body.append(key, value));
+    body.append("file", file);
+
+    const r = await fetch(upload_url, { method: "POST", body });
+    const result = await r.json().catch(() => ({}));
+    if (!r.ok) {
+      throw new Error(result.error?.message || `Image upload failed (HTTP ${r.status})`);
+    }
+    return result;
+  },
+
+  // Swaps a selected image_file in the product form for its direct upload
+  async withUploadedImage(formData) {
+    const file = formData.get("image_file");
+    formData.delete("image_file");
+    if (file && file.size) {
+      const uploaded = await this.uploadImage(file);
+      formData.append("image_public_id", uploaded.public_id);
+      formData.append("image_version", uploaded.version);
+      formData.append("image_signature", uploaded.signature);
+    }
+    return formData;
+  },
+
+  async createProduct(formData) {
+    const body = await this.withUploadedImage(formData);
     return fetch(`${API_BASE}/inventory/product`, {
       method: "POST",
       headers: { Authorization: `Bearer ${getToken()}` },
-      body: formData,
+      body,
     }).then(async (r) => {
       if (!r.ok) {
         const err = await r.json().catch(() => ({}));
@@ -370,11 +421,12 @@ const adminAPI = {
     });
   },
 
-  updateProduct(id, formData) {
+  async updateProduct(id, formData) {
+    const body = await this.withUploadedImage(formData);
     return fetch(`${API_BASE}/inventory/product/${id}`, {
       method: "PUT",
       headers: { Authorization: `Bearer ${getToken()}` },
-      body: formData,
+      body,
     }).then(async (r) => {
       if (!r.ok) {
         const err = await r.json().catch(() => ({}));
@@ -267,7 +267,55 @@ finally:
     fi
 }
 
-# Test 7: Container Health
+# Test 7: Index Usage
+test_index_usage() {
+    print_test "Testing that hot queries use their indexes..."
+    
+    if sudo docker compose exec -T backend python -c "
+from app.database import SessionLocal
+from app.models import Order, Cart, Transaction
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+db = SessionLocal()
+try:
+    # Dev tables are tiny, so force the planner to show which index it would pick
+    db.execute(text('SET enable_seqscan = off'))
+
+    checks = {
+        'get_user_orders': (db.query(Order).filter(Order.user_id == 1), 'ix_orders_user_id_updated_at'),
+        'get_cart_items': (db.query(Cart).filter(Cart.user_id == 1), 'uq_cart_user_id_product_id'),
+        'webhook transactions by reference': (db.query(Transaction).filter(Transaction.reference == 'ref'), 'ix_transactions_reference'),
+        'webhook transactions by order': (db.query(Transaction).filter(Transaction.order_id.in_([1, 2])), 'ix_transactions_order_id'),
+    }
+
+    failed = False
+    for name, (query, index_name) in checks.items():
+        sql = str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+        plan = '\\n'.join(row[0] for row in db.execute(text('EXPLAIN ' + sql)))
+        if index_name in plan:
+            print(f'✅ {name} uses {index_name}')
+        else:
+            print(f'❌ {name} does not use {index_name}:\\n{plan}')
+            failed = True
+
+    if failed:
+        exit(1)
+except Exception as e:
+    print(f'❌ Index usage check failed: {e}')
+    exit(1)
+finally:
+    db.close()
+"; then
+        print_pass "Index usage test passed"
+        return 0
+    else
+        print_fail "Index usage test failed"
+        return 1
+    fi
+}
+
+# Test 8: Container Health
 test_container_health() {
     print_test "Testing container health..."
     
@@ -301,6 +349,7 @@ main() {
         "test_api_endpoints"
         "test_migration_system"
         "test_database_performance"
+        "test_index_usage"
     )
     
     total_tests=${#tests[@]}